@@ -2,27 +2,212 @@
 # PyQt/PySide GUI for testing TeleSocial Python API
 #
 
+import logging
+import os
 import sys
+import threading
+import time
+
+try:
+    from reprlib import Repr
+    from logging.handlers import QueueHandler, QueueListener
+    from queue import Queue
+except ImportError:
+    # Python 2.x: logging stays synchronous
+    from repr import Repr
+    QueueHandler = None
 
 UI_FILE = "telesocial-gui.ui"
 
 try:
-    # PySide version
-    raise
-    from PySide import QtCore, QtGui
-    from PySide.QtUiTools import QUiLoader
-except:
     # PyQt version
     from PyQt4 import QtCore, QtGui, uic
     QtCore.Signal = QtCore.pyqtSignal
     QtCore.Slot = QtCore.pyqtSlot
+    _BACKEND = 'pyqt'
+except ImportError:
+    # PySide version
+    from PySide import QtCore, QtGui
+    from PySide.QtUiTools import QUiLoader
+    _BACKEND = 'pyside'
 
 
+# telesocial itself is imported on first use, see MyMainWindow.client
 sys.path.append("..")
-import telesocial
+
+log = logging.getLogger('telesocial.gui')
 
 APP_KEY = "f180804f-5eda-4e6b-8f4e-ecea52362396" # commonly seen in many of the examples
 
+STATUS_TTL = 10.0 # seconds a network id status is reused before asking the server again
+MAX_WORKERS = 8 # REST calls allowed in flight at once
+STATUS_THROTTLE = 0.5 # seconds; repeated clicks on a status button within this are ignored
+
+# status bar text for a response: nested dicts and lists are cut short instead of formatted in full
+_brief = Repr()
+_brief.maxlevel = 3
+_brief.maxdict = _brief.maxlist = 8
+_brief.maxstring = 80
+
+def brief(data):
+    return _brief.repr(data)
+
+# per .ui file: (ui_class, widget_class) with PyQt, the file contents with PySide;
+# so each file is read (and with PyQt, compiled) only once
+_UI_CACHE = {}
+
+# load_ui(path, instance) sets up the widgets of a .ui file on instance and returns the ui object;
+# only the current binding's version is defined
+if _BACKEND == 'pyqt':
+    def _load_ui_type(path):
+        if path not in _UI_CACHE:
+            _UI_CACHE[path] = uic.loadUiType(path)
+        return _UI_CACHE[path]
+
+    def load_ui(path, instance):
+        ui_class, widget_class = _load_ui_type(path)
+        ui = ui_class()
+        ui.setupUi(instance)
+        return ui
+else:
+    class MyQUiLoader(QUiLoader):
+        def __init__(self, baseinstance):
+            super(MyQUiLoader, self).__init__()
+            self.baseinstance = baseinstance
+    
+        def createWidget(self, className, parent=None, name=""):
+            widget = super(MyQUiLoader, self).createWidget(className, parent, name)
+            if parent is None:
+                return self.baseinstance
+            else:
+                setattr(self.baseinstance, name, widget)
+                return widget
+    
+    def loadUi(uifile, baseinstance=None):
+        loader = MyQUiLoader(baseinstance)
+        ui = loader.load(uifile)
+        QtCore.QMetaObject.connectSlotsByName(ui)
+        return ui
+
+    def load_ui(path, instance):
+        if path not in _UI_CACHE:
+            with open(path, 'rb') as f:
+                _UI_CACHE[path] = f.read()
+        buf = QtCore.QBuffer()
+        buf.setData(_UI_CACHE[path])
+        buf.open(QtCore.QIODevice.ReadOnly)
+        return loadUi(buf, instance)
+
+
+# item/edit text() is a QString with PyQt4's v1 API and needs converting; elsewhere it already is a string
+to_str = str if hasattr(QtCore, 'QString') else (lambda text: text)
+
+try:
+    text_type = unicode
+except NameError:
+    text_type = str
+
+def to_text(value):
+    """A QSettings key or value as unicode; PyQt4's v1 API wraps values in a QVariant"""
+    if hasattr(value, 'toString'):
+        value = value.toString()
+    return text_type(value)
+
+
+def sync_tree_items(tree, rows):
+    """Make the top level items of a QTreeWidget match rows (tuples of column texts).
+
+    Rows already shown are left alone, with whatever extra columns or children they
+    have; only the difference is removed and added, in one batch with a single repaint.
+    """
+    # these loops run once per row, so look the methods up once
+    top_level_item = tree.topLevelItem
+    columns = range(len(rows[0]) if rows else 0)
+    keys = []
+    for index in range(tree.topLevelItemCount()):
+        text = top_level_item(index).text
+        keys.append(tuple([to_str(text(column)) for column in columns]))
+    if keys == rows:
+        return
+    wanted = set(rows)
+    kept = set()
+    tree.setUpdatesEnabled(False)
+    tree.blockSignals(True)
+    try:
+        take = tree.takeTopLevelItem
+        for index in reversed(range(len(keys))):
+            key = keys[index]
+            if key in wanted and key not in kept:
+                kept.add(key)
+            else:
+                take(index)
+        TreeItem = QtGui.QTreeWidgetItem
+        tree.addTopLevelItems([TreeItem(list(row)) for row in rows if row not in kept])
+    finally:
+        tree.blockSignals(False)
+        tree.setUpdatesEnabled(True)
+
+
+def selected_ids(widget, *column):
+    """Text of the selected items as plain strings; pass the column for a QTreeWidget"""
+    return [to_str(item.text(*column)) for item in widget.selectedItems()]
+
+
+def sync_list_items(widget, texts):
+    """Make a QListWidget show texts, removing and adding only what changed, with a single repaint"""
+    item = widget.item
+    current = [to_str(item(row).text()) for row in range(widget.count())]
+    if current == texts:
+        return
+    wanted = set(texts)
+    kept = set()
+    widget.setUpdatesEnabled(False)
+    try:
+        take = widget.takeItem
+        for row in reversed(range(len(current))):
+            text = current[row]
+            if text in wanted and text not in kept:
+                kept.add(text)
+            else:
+                take(row)
+        widget.addItems([text for text in texts if text not in kept])
+    finally:
+        widget.setUpdatesEnabled(True)
+
+
+class ApiSignals(QtCore.QObject):
+    """Signals for ApiWorker; QRunnable is not a QObject so it can't carry them itself"""
+    finished = QtCore.Signal(object)
+    error = QtCore.Signal(Exception)
+    progress = QtCore.Signal(int, int)
+
+
+class ApiWorker(QtCore.QRunnable):
+    """Runs one client call on the thread pool and reports back through signals"""
+
+    def __init__(self, fn, *args, **kwargs):
+        super(ApiWorker, self).__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = ApiSignals()
+
+    def run(self):
+        try:
+            res = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.finished.emit(res)
+
+
+class TransferWorker(ApiWorker):
+    """Runs an upload or download, emitting progress(bytes_done, total) along the way"""
+
+    def __init__(self, fn, *args):
+        super(TransferWorker, self).__init__(fn, *args)
+        self.kwargs['progress'] = self.signals.progress.emit
+
 
 class MyMainWindow(QtGui.QMainWindow):
 
@@ -30,176 +215,325 @@ class MyMainWindow(QtGui.QMainWindow):
         super(MyMainWindow, self).__init__(parent)
         
         # the GUI is loaded here
-        self.ui = None
-        
-        if 'QUiLoader' in globals():
-            # PySide
-            self.ui = loadUi(UI_FILE, self)
-        if 'uic' in globals():
-            # PyQt
-            ui_class, widget_class = uic.loadUiType(UI_FILE) 
-            self.ui = ui_class() 
-            self.ui.setupUi(self)
+        self.ui = load_ui(UI_FILE, self)
 
         # read from a config file our key and other settings...
         self.settings = QtCore.QSettings('./telesocial-gui.ini', QtCore.QSettings.IniFormat)
+        # ...once; later reads are served from here and only writes go back to the file
+        self._settings_cache = dict((to_text(key), to_text(self.settings.value(key)))
+                                    for key in self.settings.allKeys())
         
         # get the API/APP key. If none set, use the default
-        appkey = str(self.settings.value('appkey', APP_KEY).toString().toAscii())
+        self._appkey = self.setting('appkey', APP_KEY)
         
         self.show()
         
-        # telesocial client object
-        self.client = telesocial.SimpleClient(appkey)
+        # telesocial client object, created by the first call that needs it
+        self._client = None
+        self._client_lock = threading.Lock()
+
+        # REST calls run here so the event loop keeps pumping while we wait
+        self.pool = QtCore.QThreadPool.globalInstance()
+        self.pool.setMaxThreadCount(MAX_WORKERS)
+
+        # upload/download progress, shown in the status bar while a transfer is running
+        self.transferBar = QtGui.QProgressBar()
+        self.transferBar.setMaximumWidth(200)
+        self.transferBar.hide()
+        self.statusBar().addPermanentWidget(self.transferBar)
+
+        # refreshes that are waiting out the debounce delay, and those still running
+        self._refresh_timers = {}
+        self._inflight = set()
+        # when each status button last actually sent its requests
+        self._last_status_call = {}
+
+        # the server version doesn't change while we run; statuses are kept for STATUS_TTL
+        self._version = None
+        self._status_cache = {}
+
+        # one non-native file dialog, kept around so later opens don't pay its setup again
+        self.mediaFileDialog = QtGui.QFileDialog(self, "Open Media")
+        self.mediaFileDialog.setNameFilter("MP3 Files (*.mp3)")
+        self.mediaFileDialog.setFileMode(QtGui.QFileDialog.ExistingFile)
+        self.mediaFileDialog.setOption(QtGui.QFileDialog.DontUseNativeDialog)
+        # start where the last file was picked, also across restarts
+        media_dir = self.setting('media_dir')
+        if media_dir:
+            self.mediaFileDialog.setDirectory(media_dir)
+        self.mediaFileDialog.fileSelected.connect(self.set_media_file)
+
+        # dialogs are built on first use and then kept for the next time
+        self._prefs_dlg = None
+        self._register_dlg = None
+
+        # import telesocial and build the client on a pool thread, so not even the
+        # first button press has to do it on the GUI thread
+        self.submit(None, lambda: self.client)
     
+    def setting(self, key, default=None):
+        return self._settings_cache.get(key, default)
+
+    def set_setting(self, key, value):
+        self._settings_cache[key] = value
+        self.settings.setValue(key, value)
+        self.settings.sync()
+
     def get_api_key(self):
         return self.ui.editAPIKey.currentText()
             
+    @QtCore.Slot(str)
     def showMessage(self, msg):
         self.statusBar().showMessage(msg)
+
+    def submit(self, on_result, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the thread pool; on_result(res) is called back on the GUI thread"""
+        self.start_worker(ApiWorker(fn, *args, **kwargs), on_result)
+
+    def submit_each(self, on_result, fn, items):
+        """submit fn(item) once per item so independent calls overlap; on_result sees each reply"""
+        for item in items:
+            self.submit(on_result, fn, item)
+
+    def start_worker(self, worker, on_result):
+        # the worker emits from a pool thread; queue the calls onto the GUI thread explicitly
+        if on_result:
+            worker.signals.finished.connect(on_result, QtCore.Qt.QueuedConnection)
+        worker.signals.error.connect(self.on_api_error, QtCore.Qt.QueuedConnection)
+        self.pool.start(worker)
+
+    def debounce(self, key, fn, delay=250):
+        """Call fn once `delay` ms after the last of a burst of calls with the same key"""
+        timer = self._refresh_timers.get(key)
+        if timer is None:
+            timer = QtCore.QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(fn)
+            self._refresh_timers[key] = timer
+        timer.start(delay)
+
+    def throttle(self, key, interval=STATUS_THROTTLE):
+        """False if the action named key already ran less than `interval` seconds ago"""
+        now = time.time()
+        if now - self._last_status_call.get(key, 0) < interval:
+            return False
+        self._last_status_call[key] = now
+        return True
+
+    def submit_once(self, key, on_result, fn, *args, **kwargs):
+        """Like submit, but does nothing while an earlier call with the same key is still running"""
+        if key in self._inflight:
+            return
+        self._inflight.add(key)
+        worker = ApiWorker(fn, *args, **kwargs)
+        worker.signals.finished.connect(lambda res: self._inflight.discard(key),
+                                       QtCore.Qt.QueuedConnection)
+        worker.signals.error.connect(lambda e: self._inflight.discard(key),
+                                    QtCore.Qt.QueuedConnection)
+        self.start_worker(worker, on_result)
+
+    @property
+    def client(self):
+        """The telesocial client; the module and its network stack are only loaded here"""
+        with self._client_lock:
+            if self._client is None:
+                import telesocial
+                # keep as many connections alive as there can be calls in flight
+                pool = telesocial.PoolManager(num_pools=2, maxsize=MAX_WORKERS)
+                self._client = telesocial.SimpleClient(self._appkey, pool=pool)
+            return self._client
+
+    def set_appkey(self, key):
+        self._appkey = key
+        if self._client is not None:
+            self._client.appkey = key
+        # statuses depend on the application the key belongs to
+        self._status_cache.clear()
+
+    def network_id_status(self, network_id):
+        """client.network_id_status, reusing a result younger than STATUS_TTL seconds"""
+        hit = self._status_cache.get(network_id)
+        if hit and time.time() - hit[0] < STATUS_TTL:
+            return hit[1]
+        res = self.client.network_id_status(network_id)
+        self._status_cache[network_id] = (time.time(), res)
+        return res
+
+    def network_id_register(self, network_id, phone):
+        """client.network_id_register, forgetting the id's cached (unregistered) status"""
+        try:
+            return self.client.network_id_register(network_id, phone)
+        finally:
+            self._status_cache.pop(network_id, None)
+
+    def network_id_delete_many(self, network_ids):
+        """client.network_id_delete_many, forgetting the ids' cached statuses"""
+        try:
+            return self.client.network_id_delete_many(network_ids)
+        finally:
+            for network_id in network_ids:
+                self._status_cache.pop(network_id, None)
+
+    @QtCore.Slot(object)
+    def on_api_error(self, e):
+        log.warning("%s", e)
+        self.showMessage(str(e))
+
+    @QtCore.Slot(object)
+    def show_response(self, res):
+        # expected errors (e.g. an unknown network id) come back as a response, not an exception
+        if not res.ok:
+            log.warning("%s %s", res.code, res.data)
+            self.showMessage("{0}: {1}".format(res.code, brief(res.data)))
+            return
+        log.debug("%s %s", res.code, res.data)
+        self.showMessage(brief(res.data))
+
+    @QtCore.Slot(object)
+    def show_responses(self, results):
+        for res in results:
+            self.show_response(res)
         
     # Menu items
     
     @QtCore.Slot()
     def on_actionExit_triggered(self):
-        print("on_actionExit_triggered")
+        log.debug("on_actionExit_triggered")
         self.close()
         
     @QtCore.Slot()
     def on_actionPreferences_triggered(self):
         """Display and set preferences"""
-        dlg = PreferencesDialog(self)
+        if self._prefs_dlg is None:
+            self._prefs_dlg = PreferencesDialog(self)
+        dlg = self._prefs_dlg
         # set the initial default value(s)
-        dlg.ui.editAPIKey.setText(str(self.client.appkey))
+        dlg.ui.editAPIKey.setText(self._appkey)
         response = dlg.exec_()
-        print(response)
+        log.debug("%s", response)
         key = dlg.ui.editAPIKey.text()
         if key:
             # set new preferences and update client object
-            self.client.appkey = str(key)
-            self.settings.setValue('appkey', key)
+            self.set_appkey(str(key))
+            self.set_setting('appkey', str(key))
             
     @QtCore.Slot()
     def on_actionAbout_triggered(self):
-        print("on_actionAbout_triggered")
+        log.debug("on_actionAbout_triggered")
         QtGui.QMessageBox.about(self, "About Me", "Simple application to test TeleSocial API")
         
     @QtCore.Slot()
     def on_editAPIKey_editingFinished(self):
-        print("setting API key")
-        key = str(self.ui.editAPIKey.text())
-        print("new API key is ", key)
-        self.client.appkey = key
+        # editingFinished also fires on every focus change; settle first, then apply once
+        self.debounce('appkey', self.apply_api_key, 500)
+
+    def apply_api_key(self):
+        key = to_str(self.ui.editAPIKey.text())
+        if not key or key == self._appkey:
+            return
+        log.debug("new API key is %s", key)
+        self.set_appkey(key)
+        self.set_setting('appkey', key)
 
     @QtCore.Slot()
     def on_buttonVersion_released(self):
-        print("getting version information")
-        try:
-            version = self.client.version()
-            QtGui.QMessageBox.about(self, "Version", "TeleSocial API version is {}.{}.{}".format(*version))
-        except telesocial.TelesocialServiceError as e:
-            print(e)
+        if self._version:
+            self.show_version(self._version)
+            return
+        log.debug("getting version information")
+        self.submit(self.show_version, self.client.version)
+
+    @QtCore.Slot(object)
+    def show_version(self, version):
+        self._version = version
+        QtGui.QMessageBox.about(self, "Version", "TeleSocial API version is {}.{}.{}".format(*version))
 
     # Registration Tab
     
     @QtCore.Slot()
     def on_buttonNetworkAdd_released(self):
         """Add a new network id registration via popup dialog"""
-        dlg = RegisterDialog(self)
-#        dlg.show()
+        if self._register_dlg is None:
+            self._register_dlg = RegisterDialog(self)
+        dlg = self._register_dlg
+        # start from empty fields, not the previous registration
+        dlg.ui.editID.clear()
+        dlg.ui.editPhone.clear()
         response = dlg.exec_()
-        print(response)
+        log.debug("%s", response)
         id = dlg.ui.editID.text()
         phone = dlg.ui.editPhone.text()
         if id and phone:
-            try:
-                print("id:{}, phone:{}".format(id, phone))
-                res = self.client.network_id_register(str(id), str(phone))
-                print(res.code, res.data)
-                self.showMessage(str(res.data))
-            except telesocial.TelesocialError as e:
-                print(e)
+            log.debug("id:%s, phone:%s", id, phone)
+            self.submit(self.show_response, self.network_id_register, str(id), str(phone))
             
     @QtCore.Slot()
     def on_buttonNetworkRefresh_released(self):
         """Update the list of Network IDs in the List Widget"""
-        print("getting Network IDs")
-        try:
-            res = self.client.network_id_list()
-            print("ids:", res.code, res.data)
-            self.showMessage(str(res.data))
-            print(res.data.keys())
-            self.ui.listNetworkIDs.clear()
-            for id in res.data['NetworkidListResponse']['networkids']:
-                self.ui.listNetworkIDs.addItem(str(id))
-        except telesocial.TelesocialError as e:
-            print(e)
+        self.debounce('network', self.refresh_network_ids)
+
+    def refresh_network_ids(self):
+        log.debug("getting Network IDs")
+        self.submit_once('network', self.populate_network_ids, self.client.network_id_list)
+
+    @QtCore.Slot(object)
+    def populate_network_ids(self, res):
+        log.debug("ids: %s %s", res.code, res.data)
+        self.showMessage(brief(res.data))
+        log.debug("%s", res.data.keys())
+        ids = [str(id) for id in res.data['NetworkidListResponse']['networkids']]
+        sync_list_items(self.ui.listNetworkIDs, ids)
 
     @QtCore.Slot()
     def on_buttonNetworkStatus_released(self):
         # retrieve status and display
         #items = self.ui.listNetworkIDs.selectedItems()
         id = self.ui.editNetworkID.text()
+        if not self.throttle('network status'):
+            return
         #for item in items:
-        print("status for network id ", id)
-        res = self.client.network_id_status(str(id))
-        print(res.code, res.data)
-        self.showMessage(str(res.data))
+        log.debug("status for network id %s", id)
+        self.submit(self.show_response, self.network_id_status, str(id))
 
     @QtCore.Slot()
     def on_buttonNetworkStatus1_released(self):
         # status of selected item
-        items = self.ui.listNetworkIDs.selectedItems()
-        for item in items:
-            id = str(item.text())
-            print("status for network id ", id)
-            res = self.client.network_id_status(str(id))
-            print(res.code, res.data)
-            self.showMessage(str(res.data))
+        if not self.throttle('network status selected'):
+            return
+        ids = selected_ids(self.ui.listNetworkIDs)
+        log.debug("status for network ids %s", ids)
+        self.submit_each(self.show_response, self.network_id_status, ids)
 
     @QtCore.Slot()
     def on_buttonNetworkDelete_released(self):
         # delete all selected items
-        items = self.ui.listNetworkIDs.selectedItems()
-        for item in items:
-            id = str(item.text())
-            print("deleting network id ", id)
-            res = self.client.network_id_delete(id)
-            print(res.code, res.data)
-            self.showMessage(str(res.data))
+        ids = selected_ids(self.ui.listNetworkIDs)
+        log.debug("deleting network ids %s", ids)
+        self.submit(self.show_responses, self.network_id_delete_many, ids)
 
     # Conference Tab
     
     @QtCore.Slot()
     def on_buttonConferenceCreate_released(self):
-        print("creating conference")
-        try:
-            network_ids = self.ui.listNetworkIDs.selectedItems()
-            if network_ids:
-                # only use the first one
-                network_id = str(network_ids[0].text()) 
-                res = self.client.conference_create(network_id)
-                self.showMessage(str(res.data))
-        except telesocial.TelesocialError as e:
-            print(e)
+        log.debug("creating conference")
+        network_ids = selected_ids(self.ui.listNetworkIDs)
+        if network_ids:
+            # only use the first one
+            network_id = network_ids[0]
+            self.submit(self.show_response, self.client.conference_create, network_id)
         
     @QtCore.Slot()
     def on_buttonConferenceAdd_released(self):
-        print("adding to conference")
-        items = self.ui.listConferenceIDs.selectedItems()
-        if items:
-            conference_id = str(items[0].text(0))
-            try:
-                items2 = self.ui.listNetworkIDs.selectedItems()
-                for item2 in items2:
-                    network_id = str(item2.text())
-                    self.client.conference_add(conference_id, network_id)
-            except telesocial.TelesocialError as e:
-                print(e)
+        log.debug("adding to conference")
+        conference_ids = selected_ids(self.ui.listConferenceIDs, 0)
+        if conference_ids:
+            conference_id = conference_ids[0]
+            network_ids = selected_ids(self.ui.listNetworkIDs)
+            self.submit(self.show_responses, self.client.conference_add_many, conference_id, network_ids)
 
     @QtCore.Slot()
     def on_buttonConferenceRemove_released(self):
-        print("removing from conference")
+        log.debug("removing from conference")
         items = self.ui.listConferenceIDs.selectedItems()
         if items:
             # only do one for now
@@ -207,16 +541,13 @@ class MyMainWindow(QtGui.QMainWindow):
             # check for its parent
             parent = item.parent()
             if parent:
-                conference_id = str(parent.text(0))
-                network_id = str(item.text(0))
-                try:
-                    self.client.conference_hangup(conference_id, network_id)
-                except telesocial.TelesocialError as e:
-                    print(e)
+                conference_id = to_str(parent.text(0))
+                network_id = to_str(item.text(0))
+                self.submit(None, self.client.conference_hangup, conference_id, network_id)
 
     @QtCore.Slot()
     def on_buttonConferenceMute_released(self):
-        print("muting network id in conference")
+        log.debug("muting network id in conference")
         items = self.ui.listConferenceIDs.selectedItems()
         if items:
             # only do one for now
@@ -224,226 +555,232 @@ class MyMainWindow(QtGui.QMainWindow):
             # check for its parent
             parent = item.parent()
             if parent:
-                conference_id = str(parent.text(0))
-                network_id = str(item.text(0))
-                muted = str(item.text(1))
-                try:
-                    if muted == "unmuted":
-                        self.client.conference_mute(conference_id, network_id)
-                        item.setText(1, "muted")
-                    else:
-                        self.client.conference_unmute(conference_id, network_id)
-                        item.setText(1, "unmuted")
-                except telesocial.TelesocialError as e:
-                    print(e)
+                conference_id = to_str(parent.text(0))
+                network_id = to_str(item.text(0))
+                muted = to_str(item.text(1))
+                if muted == "unmuted":
+                    self.submit(lambda res: item.setText(1, "muted"),
+                                self.client.conference_mute, conference_id, network_id)
+                else:
+                    self.submit(lambda res: item.setText(1, "unmuted"),
+                                self.client.conference_unmute, conference_id, network_id)
 
     def on_buttonConferenceClose_released(self):
-        print("closing conference")
-        items = self.ui.listConferenceIDs.selectedItems()
-        for item in items:
-            conference_id = str(item.text(0))
-            try:
-                res = self.client.conference_close(conference_id)
-                print(res.code, res.data)
-                self.showMessage(str(res.data))
-            except telesocial.TelesocialError as e:
-                print(e)
-                self.showMessage(str(e))
+        log.debug("closing conference")
+        conference_ids = selected_ids(self.ui.listConferenceIDs, 0)
+        self.submit_each(self.show_response, self.client.conference_close, conference_ids)
 
     @QtCore.Slot()
     def on_buttonConferenceDetails_released(self):
-        print("getting conference details")
-        items = self.ui.listConferenceIDs.selectedItems()
-        for item in items:
-            try:
-                conference_id = item.text(0)
-                res = self.client.conference_details(str(conference_id))
-                for participant in res.data['ConferenceDetailsResponse']['participants']:
-                    # Add as children
-                    item.addChild(QtGui.QTreeWidgetItem([participant, "unmuted"]))
-                item.setExpanded(True)
-                print(res.code, res.data)
-                self.showMessage(str(res.data))
-            except telesocial.TelesocialError as e:
-                print(e)
+        log.debug("getting conference details")
+        for item in self.ui.listConferenceIDs.selectedItems():
+            self.fetch_conference_details(item)
+
+    def fetch_conference_details(self, item):
+        """Ask for the participants of the conference in item; one worker each, so several run at once"""
+        conference_id = to_str(item.text(0))
+        self.submit(lambda res, item=item: self.show_conference_details(item, res),
+                    self.client.conference_details, conference_id)
+
+    def show_conference_details(self, item, res):
+        # replace the participants (as children) in one go, so asking twice doesn't list them twice
+        participants = [QtGui.QTreeWidgetItem([str(participant), "unmuted"])
+                        for participant in res.data['ConferenceDetailsResponse']['participants']]
+        tree = self.ui.listConferenceIDs
+        tree.setUpdatesEnabled(False)
+        try:
+            item.takeChildren()
+            item.addChildren(participants)
+            item.setExpanded(True)
+        finally:
+            tree.setUpdatesEnabled(True)
+        self.show_response(res)
 
     @QtCore.Slot()
     def on_buttonConferenceRefresh_released(self):
         """Update the list of Conference in the List Widget"""
-        print("getting conferences")
-        try:
-            res = self.client.conference_list()
-            print(res.code, res.data)
-            self.showMessage(str(res.data))
-            self.ui.listConferenceIDs.clear()
-            for id in res.data['ConferenceListResponse']['active']:
-                QtGui.QTreeWidgetItem(self.ui.listConferenceIDs, [str(id), 'active'])
-                #self.ui.listConferenceIDs.addItem(str(id))
-            for id in res.data['ConferenceListResponse']['inactive']:
-                QtGui.QTreeWidgetItem(self.ui.listConferenceIDs, [str(id), 'inactive'])
-                #self.ui.listConferenceIDs.addItem(str(id))
-        except telesocial.TelesocialError as e:
-            print(e)
+        self.debounce('conference', self.refresh_conference_ids)
+
+    def refresh_conference_ids(self):
+        log.debug("getting conferences")
+        self.submit_once('conference', self.populate_conference_ids, self.client.conference_list)
+
+    @QtCore.Slot(object)
+    def populate_conference_ids(self, res):
+        self.show_response(res)
+        lists = res.data['ConferenceListResponse']
+        rows = [(str(id), 'active') for id in lists['active']]
+        rows += [(str(id), 'inactive') for id in lists['inactive']]
+        sync_tree_items(self.ui.listConferenceIDs, rows)
+        # conferences that are opened up keep their participant lists current
+        tree = self.ui.listConferenceIDs
+        for index in range(tree.topLevelItemCount()):
+            item = tree.topLevelItem(index)
+            if item.isExpanded():
+                self.fetch_conference_details(item)
 
     # Media Tab
 
     @QtCore.Slot()
     def on_buttonMediaCreate_released(self):
-        print("creating new media resource")
-        try:
-            res = self.client.media_create()
-            print(res.code, res.data)
-            self.showMessage(str(res.data))
-            id = res.data['MediaResponse']['mediaId']
-            # add to the tree widget. perhaps best to just do a refresh
-            QtGui.QTreeWidgetItem(self.ui.listMediaIDs, [id])
-        except telesocial.TelesocialError as e:
-            print(e)
+        log.debug("creating new media resource")
+        self.submit(self.add_media_id, self.client.media_create)
+
+    @QtCore.Slot(object)
+    def add_media_id(self, res):
+        self.show_response(res)
+        id = res.data['MediaResponse']['mediaId']
+        # add to the tree widget. perhaps best to just do a refresh
+        QtGui.QTreeWidgetItem(self.ui.listMediaIDs, [id])
         
     @QtCore.Slot()
     def on_buttonMediaRecord_released(self):
-        print("recording into a media resource")
-        items = self.ui.listNetworkIDs.selectedItems()
-        if items:
+        log.debug("recording into a media resource")
+        network_ids = selected_ids(self.ui.listNetworkIDs)
+        if network_ids:
             # just use the first one
-            network_id = str(items[0].text())
+            network_id = network_ids[0]
             media_id = None
-            media_items = self.ui.listMediaIDs.selectedItems()
-            if media_items:
-                media_id = str(media_items[0].text(0))
+            media_ids = selected_ids(self.ui.listMediaIDs, 0)
+            if media_ids:
+                media_id = media_ids[0]
 
             if network_id and media_id:
-                try:
-                    res = self.client.media_record(media_id, network_id)
-                    print(res.code, res.data)
-                    self.showMessage(str(res.data))
-                except telesocial.TelesocialError as e:
-                    print(e)
+                self.submit(self.show_response, self.client.media_record, media_id, network_id)
         
     @QtCore.Slot()
     def on_buttonMediaBlast_released(self):
-        print("sending Blast to network IDs")
+        log.debug("sending Blast to network IDs")
         media_id = None
-        network_id = None
         
         # just use the first selected media ID
-        items = self.ui.listMediaIDs.selectedItems()
-        if items:
-            media_id = str(items[0].text(0))
-
-        items = self.ui.listNetworkIDs.selectedItems()
-        for item in items:
-            network_id = str(item.text())
-            
-            if network_id and media_id:
-                try:
-                    res = self.client.media_blast(media_id, network_id)
-                    print(res.code, res.data)
-                    self.showMessage(str(res.data))
-                except telesocial.TelesocialError as e:
-                    print(e)
+        media_ids = selected_ids(self.ui.listMediaIDs, 0)
+        if media_ids:
+            media_id = media_ids[0]
+
+        network_ids = selected_ids(self.ui.listNetworkIDs)
+        if media_id and network_ids:
+            self.submit(self.show_responses, self.client.media_blast_many,
+                        media_id, [network_id for network_id in network_ids if network_id])
         
     @QtCore.Slot()
     def on_buttonUploadGrant_released(self):
-        print("requesting upload grant")
+        log.debug("requesting upload grant")
         
-        # just use the first selected media ID
         items = self.ui.listMediaIDs.selectedItems()
         for item in items:
-            media_id = str(items[0].text(0))
+            media_id = to_str(item.text(0))
 
             if not media_id:
-                print("Need Media ID first")
+                log.warning("Need Media ID first")
                 return
 
-            try:
-                res = self.client.media_request_upload_grant(media_id)
-                print(res.code, res.data)
-                self.showMessage(str(res.data))
-                grant_id = res.data['UploadResponse']['grantId']
-                # set to the third column of the tree widget
-                item.setText(2, grant_id)
-            except telesocial.TelesocialError as e:
-                print(e)
+            self.submit(lambda res, item=item: self.set_upload_grant(item, res),
+                        self.client.media_request_upload_grant, media_id)
+
+    def set_upload_grant(self, item, res):
+        self.show_response(res)
+        grant_id = res.data['UploadResponse']['grantId']
+        # set to the third column of the tree widget
+        item.setText(2, grant_id)
             
     @QtCore.Slot()
     def on_buttonMediaRefresh_released(self):
         """Update the list of Media IDs in the List Widget"""
-        print("getting Media IDs")
-        try:
-            res = self.client.media_list()
-            print(res.code, res.data)
-            self.showMessage(str(res.data))
-            self.ui.listMediaIDs.clear()
-            for id in res.data['MediaidListResponse']['uploaded']:
-                #self.ui.listMediaIDs.addItem(str(id))
-                QtGui.QTreeWidgetItem(self.ui.listMediaIDs, [id, 'uploaded'])
-            for id in res.data['MediaidListResponse']['recorded']:
-                #self.ui.listMediaIDs.addItem(str(id))
-                QtGui.QTreeWidgetItem(self.ui.listMediaIDs, [id, 'recorded'])
-        except telesocial.TelesocialError as e:
-            print(e)
+        self.debounce('media', self.refresh_media_ids)
+
+    def refresh_media_ids(self):
+        log.debug("getting Media IDs")
+        self.submit_once('media', self.populate_media_ids, self.client.media_list)
+
+    @QtCore.Slot(object)
+    def populate_media_ids(self, res):
+        self.show_response(res)
+        lists = res.data['MediaidListResponse']
+        rows = [(str(id), 'uploaded') for id in lists['uploaded']]
+        rows += [(str(id), 'recorded') for id in lists['recorded']]
+        sync_tree_items(self.ui.listMediaIDs, rows)
 
     @QtCore.Slot()
     def on_buttonMediaStatus_released(self):
         # get some stats about this media
-        print("getting media status")
-        items = self.ui.listMediaIDs.selectedItems()
-        for item in items:
-            id = str(item.text(0))
-            print("getting status for ", id)
-            try:
-                res = self.client.media_status(id)
-                print(res.code, res.data)
-                self.showMessage(str(res.data))
-            except telesocial.TelesocialError as e:
-                print(e)
+        log.debug("getting media status")
+        if not self.throttle('media status'):
+            return
+        ids = selected_ids(self.ui.listMediaIDs, 0)
+        log.debug("getting status for %s", ids)
+        self.submit_each(self.show_response, self.client.media_status, ids)
 
     @QtCore.Slot()
     def on_buttonMediaDelete_released(self):
-        print("deleting media")
+        log.debug("deleting media")
         # delete all selected items
-        items = self.ui.listMediaIDs.selectedItems()
-        for item in items:
-            id = str(item.text(0))
-            print("deleting ", id)
-            res = self.client.media_remove(id)
-            print(res.code, res.data)
-            self.showMessage(str(res.data))
+        ids = selected_ids(self.ui.listMediaIDs, 0)
+        log.debug("deleting %s", ids)
+        self.submit_each(self.show_response, self.client.media_remove, ids)
 
     @QtCore.Slot()
     def on_buttonMediaChoose_released(self):
-        print("choosing an MP3 file")
-        # get an mp3 file from the FS
-        fileName = QtGui.QFileDialog.getOpenFileName(self, caption="Open Media", filter="MP3 Files (*.mp3)")
+        log.debug("choosing an MP3 file")
+        # get an mp3 file from the FS, without blocking the event loop
+        self.mediaFileDialog.show()
+
+    @QtCore.Slot(str)
+    def set_media_file(self, fileName):
         if fileName:
+            media_dir = os.path.dirname(to_text(fileName))
+            if media_dir != self.setting('media_dir'):
+                self.set_setting('media_dir', media_dir)
             items = self.ui.listMediaIDs.selectedItems()
             for item in items:
                 item.setText(3, fileName)
 
     @QtCore.Slot()
     def on_buttonMediaDownload_released(self):
-        print("downloading media file to temp.mp3")
-        # retrieve and save the given media to the local FS
-        items = self.ui.listMediaIDs.selectedItems()
-        for item in items:
-            media_id = str(item.text(0))
-            self.client.download_file(media_id, "temp.mp3")
+        log.debug("downloading media files")
+        # retrieve and save the given media to the local FS, as <media id>.mp3.
+        # each file gets its own worker so the downloads overlap
+        for media_id in selected_ids(self.ui.listMediaIDs, 0):
+            file_name = media_id + ".mp3"
+            worker = TransferWorker(self.client.download_file, media_id, file_name)
+            # download_file raises on failure, so this only runs once the file is saved
+            self.start_transfer(worker, lambda res, file_name=file_name: self.show_download(file_name))
 
     @QtCore.Slot()
     def on_buttonMediaUpload_released(self):
         # get an mp3 file from the FS
-        print("sending mp3 file to server")
+        log.debug("sending mp3 file to server")
         items = self.ui.listMediaIDs.selectedItems()
         for item in items:
             #media_id = str(item.text(0))
-            grant_id = str(item.text(2))
-            file_name = str(item.text(3))
+            grant_id = to_str(item.text(2))
+            file_name = to_str(item.text(3))
             
             if grant_id and file_name: 
-                res = self.client.upload_file(grant_id, file_name)
-                print(res)
-                self.showMessage(str(res))
+                worker = TransferWorker(self.client.upload_file_stream, grant_id, file_name)
+                self.start_transfer(worker, self.show_upload)
+
+    def start_transfer(self, worker, on_result):
+        worker.signals.progress.connect(self.show_transfer_progress, QtCore.Qt.QueuedConnection)
+        worker.signals.error.connect(self.transferBar.hide, QtCore.Qt.QueuedConnection)
+        self.start_worker(worker, on_result)
+
+    @QtCore.Slot(int, int)
+    def show_transfer_progress(self, done, total):
+        # a total of 0 (size unknown) turns the bar into a busy indicator
+        self.transferBar.setMaximum(total)
+        self.transferBar.setValue(done)
+        self.transferBar.show()
+
+    def show_download(self, file_name):
+        self.transferBar.hide()
+        self.showMessage("saved " + file_name)
+
+    @QtCore.Slot(object)
+    def show_upload(self, res):
+        self.transferBar.hide()
+        log.debug("%s", res)
+        self.showMessage(brief(res))
 
 
 class RegisterDialog(QtGui.QDialog):
@@ -452,22 +789,13 @@ class RegisterDialog(QtGui.QDialog):
         super(RegisterDialog, self).__init__(parent)
         
         # the GUI is loaded here
-        self.ui = None
-        
-        if 'QUiLoader' in globals():
-            # PySide
-            self.ui = loadUi("register-dlg.ui", self)
-        if 'uic' in globals():
-            # PyQt
-            ui_class, widget_class = uic.loadUiType("register-dlg.ui") 
-            self.ui = ui_class() 
-            self.ui.setupUi(self)
+        self.ui = load_ui("register-dlg.ui", self)
 
         self.show()
         
     def accept(self):
         super(RegisterDialog, self).accept()
-        print("accept")
+        log.debug("accept")
         return (self.ui.editID, self.ui.editPhone)
         
                 
@@ -477,22 +805,13 @@ class PreferencesDialog(QtGui.QDialog):
         super(PreferencesDialog, self).__init__(parent)
         
         # the GUI is loaded here
-        self.ui = None
-        
-        if 'QUiLoader' in globals():
-            # PySide
-            self.ui = loadUi("preferences-dlg.ui", self)
-        if 'uic' in globals():
-            # PyQt
-            ui_class, widget_class = uic.loadUiType("preferences-dlg.ui") 
-            self.ui = ui_class() 
-            self.ui.setupUi(self)
+        self.ui = load_ui("preferences-dlg.ui", self)
 
         self.show()
         
     def accept(self):
         super(PreferencesDialog, self).accept()
-        print("accept")
+        log.debug("accept")
         return (self.ui.editAPIKey)
         
 
@@ -503,30 +822,32 @@ class MyApp(QtGui.QApplication):
         self.frame = MyMainWindow()
         
     def main(self):
-        app.exec_()
+        status = self.exec_()
+        client = self.frame._client
+        if client is not None:
+            # the pool was created by the window and handed to the client, so close it too
+            client.close()
+            client.pool.close()
+        return status
         
         
-if 'QUiLoader' in globals():
-    class MyQUiLoader(QUiLoader):
-        def __init__(self, baseinstance):
-            super(MyQUiLoader, self).__init__()
-            self.baseinstance = baseinstance
-    
-        def createWidget(self, className, parent=None, name=""):
-            widget = super(MyQUiLoader, self).createWidget(className, parent, name)
-            if parent is None:
-                return self.baseinstance
-            else:
-                setattr(self.baseinstance, name, widget)
-                return widget
-    
-    def loadUi(uifile, baseinstance=None):
-        loader = MyQUiLoader(baseinstance)
-        ui = loader.load(uifile)
-        QtCore.QMetaObject.connectSlotsByName(ui)
-        return ui
+def setup_logging(level=logging.INFO):
+    """Log to stderr; where possible from a listener thread, so the GUI thread only enqueues records"""
+    logging.basicConfig(level=level)
+    if QueueHandler is None:
+        return None
+    root = logging.getLogger()
+    queue = Queue()
+    listener = QueueListener(queue, *root.handlers)
+    root.handlers = [QueueHandler(queue)]
+    listener.start()
+    return listener
 
 
 if __name__ == "__main__":
+    listener = setup_logging()
     app = MyApp()
-    sys.exit(app.main())        
\ No newline at end of file
+    status = app.main()
+    if listener:
+        listener.stop()
+    sys.exit(status)        
\ No newline at end of file
@@ -8,25 +8,103 @@ Module contains classes for interacting with Telesocial REST API.
 
 
 # IMPORTS
-import json
+import binascii
+import logging
+import os
+import select
+import shutil
+import socket
+import threading
+import time
+import zlib
+
+try:
+    import ssl
+except ImportError:
+    # Python built without SSL support, only plain http is available
+    ssl = None
 
 try:
     # Python 3.x versions
-    from urllib.parse import urlencode
-    from urllib.request import urlopen, Request
-    from urllib.error import URLError
-except:
+    from urllib.parse import urlencode, urljoin, urlsplit
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException, IncompleteRead
+except ImportError:
     # Python 2.x versions
     from urllib import urlencode
-    from urllib2 import urlopen, Request, URLError
+    from urlparse import urljoin, urlsplit
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException, IncompleteRead
     
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+
+# json_loads(bytes) decodes a response body; C-accelerated decoders are used when
+# installed (they take bytes as they are), their errors are ValueErrors like json's
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        import json
+        def json_loads(data):
+            return json.loads(data.decode('utf-8'))
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # Python 2.x without the 'futures' backport, batch helpers run sequentially
+    ThreadPoolExecutor = None
 
 # META VARIABLES
 __all__ = ['SimpleClient', 'RichClient']    # This only effects clients that do 'from telesocial import *'
 
 # COMMON DEFINITIONS
-Response = namedtuple('Response', 'code data')
+log = logging.getLogger('telesocial')
+
+# REST resource paths, relative to /api/rest/; %-formatted with the ids
+_URI_REGISTRANT = 'registrant/%s'
+_URI_REGISTRANT_PHONE = 'registrant/%s/%s'
+_URI_CONFERENCE = 'conference/%s'
+_URI_CONFERENCE_LEG = 'conference/%s/%s'
+_URI_MEDIA = 'media/%s'
+_URI_MEDIA_STATUS = 'media/status/%s'
+
+class Response(namedtuple('Response', 'code data')):
+    """
+    Server response: HTTP status code and decoded JSON data.
+    A tuple, so callers can unpack it as `code, data = res`; with the
+    empty __slots__ it carries no per-instance dict.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """
+        True for a 2xx status. Some methods (e.g. network_id_status) return
+        expected error statuses instead of raising, check this first.
+
+        @rtype: bool
+        """
+        return 200 <= self.code < 300
+
+    @property
+    def message(self):
+        """
+        Server's status message, or None. It normally sits at the top level
+        or directly inside the single *Response wrapper, so those are looked
+        up before falling back to a full search.
+
+        @rtype: string
+        """
+        data = self.data
+        if not isinstance(data, dict):
+            return None
+        if 'message' in data:
+            return data['message']
+        if len(data) == 1:
+            inner = next(iter(data.values()))
+            if isinstance(inner, dict) and 'message' in inner:
+                return inner['message']
+        return deep_find(data, 'message')
 
 class TelesocialError(Exception):
     """
@@ -50,44 +128,432 @@ class TelesocialNetworkError(TelesocialError):
 
 class TelesocialServiceError(TelesocialError):
     def __init__(self, code=None, message=None, **kwargs):
+        if message is None:
+            # e.g. an error response without a 'message' anywhere in it
+            message = 'Unknown error'
         TelesocialError.__init__(self, code=code, message=message, **kwargs)
 
-def deep_find(data, key):
+def deep_find(data, key, default=None):
     """
     Returns value associated with `key` in arbitrary deep nested dictionaries.
+    Dictionaries are searched depth-first, stopping at the first match.
 
     @type data: dict
     @param data: dict, possibly containing other dicts
     @type key: string
     @param key: key to find
+    @param default: returned when `key` is not found
     @return: value, associated with `key`
     """
-    if key in data:
-        return data[key]
-
-    r = []
-    for k in data:
-        if isinstance(data[k], dict):
-            a = deep_find(data[k], key)
-            if a or a=='':
-                r.append(a)
-    return r[0]
-
-class RequestWithMethod(Request):
+    stack = [data]
+    while stack:
+        d = stack.pop()
+        if key in d:
+            return d[key]
+        # reversed, so nested dicts are visited in their original order
+        stack.extend(v for v in reversed(list(d.values())) if isinstance(v, dict))
+    return default
+
+def response_field(res, section, key):
     """
-    Derived class so we can handle other HTTP method types. Thanks to this
-    page: http://abhinandh.com/post/2383952338/making-a-http-delete-request-with-urllib2
+    Returns res.data[section][key], the usual place of an id in a success response.
+
+    @type res: Response
+    @param res: server response
+    @type section: string
+    @param section: name of the response object, like 'MediaResponse'
+    @type key: string
+    @param key: field of the response object
+    @return: field value
+    @raise TelesocialServiceError: when the field is missing
     """
-    
-    def __init__(self, uri, method, data=None, headers={}, origin_req_host=None, unverifiable=False):
-        self._method = method
-        Request.__init__(self, uri, data, headers, origin_req_host, unverifiable)
-        
-    def get_method(self):
-        if self._method:
-            return self._method
-        else:
-            return Request.get_method(self)
+    struct = res.data.get(section) if isinstance(res.data, dict) else None
+    value = struct.get(key) if isinstance(struct, dict) else None
+    if value is None:
+        raise TelesocialServiceError(res.code, 'No {0}.{1} in response'.format(section, key))
+    return value
+
+def ensure_lists(struct, *keys):
+    """
+    Makes each of `keys` in `struct` a list: a missing (or null) value becomes
+    an empty list and a single value a one-element list. The server sends
+    one-element arrays as the bare element.
+
+    @type struct: dict
+    @param struct: response object to fix up in place
+    @type keys: strings
+    @param keys: keys holding array values
+    """
+    for key in keys:
+        value = struct.get(key)
+        if value is None:
+            struct[key] = []
+        elif not isinstance(value, list):
+            struct[key] = [value]
+
+def decode_content(data, encoding):
+    """
+    Undoes a gzip or deflate Content-Encoding; http.client leaves it in place.
+
+    @type data: bytes
+    @param data: response body as received
+    @type encoding: string
+    @param encoding: value of the Content-Encoding header, or None
+    @rtype: bytes
+    @return: decoded body
+    @raise zlib.error: on a corrupt body
+    """
+    if not data or not encoding:
+        return data
+    encoding = encoding.strip().lower()
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            # some servers send raw deflate data without the zlib header
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
+
+def encode_params(params):
+    """
+    URL-encodes request parameters. Repeated parameters may be given as
+    a list or tuple of values; urlencode's per-value sequence handling is
+    only enabled when there is one, since almost every call passes strings.
+
+    @type params: dict
+    @param params: parameter names and values
+    @rtype: string
+    @return: query string, without the leading '?'
+    """
+    for v in params.values():
+        if isinstance(v, (list, tuple)):
+            return urlencode(params, True)
+    return urlencode(params)
+
+def concurrent_map(fn, items, max_workers=8, return_exceptions=False):
+    """
+    Returns [fn(item) for item in items], issuing the calls concurrently on a
+    thread pool when one is available. Results keep the order of `items`;
+    the first exception raised by `fn` is propagated, unless `return_exceptions`
+    is set.
+
+    @type fn: callable
+    @param fn: function to apply to each item
+    @type items: iterable
+    @param items: arguments for `fn`
+    @type max_workers: int
+    @param max_workers: maximum number of calls in flight
+    @type return_exceptions: bool
+    @param return_exceptions: put a failed call's TelesocialError in its place
+        in the results instead of raising it, so the other results are kept
+    @rtype: list
+    @return: results of `fn`
+    """
+    if return_exceptions:
+        call = fn
+        def fn(item):
+            try:
+                return call(item)
+            except TelesocialError as e:
+                return e
+    items = list(items)
+    if ThreadPoolExecutor is None or len(items) < 2:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(fn, items))
+
+class ConnectionPool:
+    """
+    Keeps idle keep-alive connections to a single host, so consecutive requests
+    skip the TCP and TLS handshakes. Safe to share between threads: each request
+    takes a connection out of the pool and puts it back once the response is read.
+    """
+    CHUNK_SIZE = 64 * 1024
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+
+    def __init__(self, scheme, netloc, maxsize=16, ssl_context=None, idle_timeout=5):
+        """
+        Constructor
+
+        @type scheme: string
+        @param scheme: 'http' or 'https'
+        @type netloc: string
+        @param netloc: host name, optionally followed by ':port'
+        @type maxsize: int
+        @param maxsize: maximum number of idle connections kept open
+        @type ssl_context: ssl.SSLContext
+        @param ssl_context: context for new HTTPS connections; by default each
+            connection creates (and loads the CA certificates into) its own
+        @type idle_timeout: float
+        @param idle_timeout: seconds an idle connection is reused; servers drop
+            keep-alive connections after as little as 5 (Apache's default)
+        """
+        self.scheme = scheme
+        self.netloc = netloc
+        self.maxsize = maxsize
+        self.ssl_context = ssl_context
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _dropped(conn):
+        # an idle connection has nothing to read, unless the server has closed
+        # it (EOF) or sent something unasked; either way it can't be reused
+        sock = conn.sock
+        if sock is None:
+            return True
+        try:
+            if hasattr(select, 'poll'):
+                poll = select.poll()
+                poll.register(sock, select.POLLIN)
+                return bool(poll.poll(0))
+            return bool(select.select([sock], [], [], 0)[0])
+        except (select.error, socket.error, ValueError):
+            return True
+
+    def _get_conn(self):
+        stale = []
+        with self._lock:
+            expired = time.time() - self.idle_timeout
+            while self._idle:
+                conn, idle_since = self._idle.pop()
+                if idle_since >= expired and not self._dropped(conn):
+                    break
+                stale.append(conn)
+            else:
+                conn = None
+        for old in stale:
+            old.close()
+        if conn is not None:
+            return conn, True
+        if self.scheme == 'https':
+            if self.ssl_context is not None:
+                return HTTPSConnection(self.netloc, context=self.ssl_context), False
+            return HTTPSConnection(self.netloc), False
+        return HTTPConnection(self.netloc), False
+
+    def _put_conn(self, conn):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append((conn, time.time()))
+                return
+        conn.close()
+
+    def urlopen(self, method, path, body=None, headers=None, out=None):
+        """
+        Sends a request and reads the whole response. If `out` is given, a 2xx
+        response body is copied into it in CHUNK_SIZE pieces instead of being
+        returned, so large downloads never sit in memory. A request that fails
+        on a reused connection is sent once more on another one, unless its
+        method isn't idempotent and the request was already written.
+
+        @type method: string
+        @param method: HTTP method, like 'GET' or 'POST'
+        @type path: string
+        @param path: request path, including the query string
+        @type body: bytes
+        @param body: request body
+        @type headers: dict
+        @param headers: additional request headers
+        @type out: file
+        @param out: writable binary file for the response body
+        @rtype: tuple
+        @return: (response, response body as bytes; empty if written to `out`)
+        @raise TelesocialNetworkError: on any connection problems
+        """
+        # file-like bodies have to be sent again from the start on a retry
+        rewind = getattr(body, 'seek', None)
+        idempotent = method in self.IDEMPOTENT_METHODS
+        while True:
+            conn, reused = self._get_conn()
+            resp = None
+            sent = False
+            if rewind is not None:
+                rewind(0)
+            try:
+                conn.request(method, path, body, headers or {})
+                sent = True
+                resp = conn.getresponse()
+                if out is not None and 200 <= resp.status < 300:
+                    shutil.copyfileobj(resp, out, self.CHUNK_SIZE)
+                    # reading in pieces stops quietly when the server closes early
+                    if resp.length:
+                        raise IncompleteRead(b'', resp.length)
+                    data = b''
+                else:
+                    data = decode_content(resp.read(), resp.getheader('Content-Encoding'))
+            except (HTTPException, socket.error, zlib.error) as e:
+                conn.close()
+                if reused and resp is None and (idempotent or not sent):
+                    # the server may have dropped an idle connection, try another one;
+                    # a POST it may already have received is not sent again
+                    continue
+                raise TelesocialNetworkError(e)
+            if resp.will_close:
+                conn.close()
+            else:
+                self._put_conn(conn)
+            return resp, data
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, idle_since in idle:
+            conn.close()
+
+
+class PoolManager:
+    """
+    Hands out a ConnectionPool per (scheme, host), keeping at most `num_pools`
+    of them around. Like urlopen, redirects of GET requests are followed.
+    Transient failures are retried with exponential backoff: connection errors
+    and RETRY_CODES for idempotent methods, and for any method a 503, which
+    tells the request was not processed. A POST that may have reached the
+    server (e.g. a blast) is never sent twice. A download streamed into `out`
+    is only retried when `out` can be rewound and truncated to where it started.
+    """
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+    MAX_REDIRECTS = 5
+    RETRY_CODES = (502, 503, 504)
+    IDEMPOTENT_METHODS = ConnectionPool.IDEMPOTENT_METHODS
+
+    def __init__(self, num_pools=4, maxsize=16, ssl_context=None, retries=2, backoff_factor=0.3,
+                 idle_timeout=5):
+        """
+        Constructor
+
+        @type num_pools: int
+        @param num_pools: number of hosts to keep connections for
+        @type maxsize: int
+        @param maxsize: maximum number of idle connections kept per host
+        @type ssl_context: ssl.SSLContext
+        @param ssl_context: context shared by all HTTPS connections; a default
+            one is created on the first HTTPS request when omitted
+        @type retries: int
+        @param retries: how many times a failed request may be sent again
+        @type backoff_factor: float
+        @param backoff_factor: seconds to wait before the first retry; doubled for each next one
+        @type idle_timeout: float
+        @param idle_timeout: seconds an idle connection is reused
+        """
+        self.num_pools = num_pools
+        self.maxsize = maxsize
+        self.ssl_context = ssl_context
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.idle_timeout = idle_timeout
+        self._pools = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pool(self, scheme, netloc):
+        key = (scheme, netloc.lower())
+        with self._lock:
+            pool = self._pools.pop(key, None)
+            if pool is None:
+                if scheme == 'https' and self.ssl_context is None and hasattr(ssl, 'create_default_context'):
+                    # certificates are loaded once, not for every new connection
+                    self.ssl_context = ssl.create_default_context()
+                pool = ConnectionPool(scheme, netloc, self.maxsize, self.ssl_context, self.idle_timeout)
+            self._pools[key] = pool
+            if len(self._pools) > self.num_pools:
+                old_key, old_pool = self._pools.popitem(last=False)
+                old_pool.close()
+        return pool
+
+    def request(self, method, url, body=None, headers=None, out=None, redirects=None):
+        """
+        Sends a request to an absolute http(s) URL.
+
+        @see: PoolManager.urlopen
+        @rtype: tuple
+        @return: (status code, response body as bytes)
+        @raise TelesocialNetworkError: on any connection problems
+        """
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        return self.urlopen(method, parts.scheme, parts.netloc, path, body, headers, out, redirects)
+
+    def urlopen(self, method, scheme, netloc, path, body=None, headers=None, out=None, redirects=None):
+        """
+        Sends a request to a host given by its already split URL parts, which
+        spares callers that always talk to the same host from parsing the URL.
+
+        @type scheme: string
+        @param scheme: 'http' or 'https'
+        @type netloc: string
+        @param netloc: host name, optionally followed by ':port'
+        @type path: string
+        @param path: request path, including the query string
+        @type redirects: int
+        @param redirects: how many more redirects to follow, MAX_REDIRECTS by default
+        @see: ConnectionPool.urlopen
+        @rtype: tuple
+        @return: (status code, response body as bytes)
+        @raise TelesocialNetworkError: on any connection problems
+        """
+        if redirects is None:
+            redirects = self.MAX_REDIRECTS
+        resp, data = self._send(method, scheme, netloc, path, body, headers, out)
+        location = resp.getheader('Location')
+        if redirects > 0 and method == 'GET' and resp.status in self.REDIRECT_CODES and location:
+            url = urljoin('{0}://{1}{2}'.format(scheme, netloc, path), location)
+            return self.request(method, url, body, headers, out, redirects - 1)
+        return resp.status, data
+
+    def _send(self, method, scheme, netloc, path, body, headers, out):
+        idempotent = method in self.IDEMPOTENT_METHODS
+        pool = self._pool(scheme, netloc)
+        mark = None
+        if out is not None:
+            try:
+                mark = out.tell()
+            except (AttributeError, IOError, OSError):
+                pass
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            if attempt:
+                time.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+            try:
+                resp, data = pool.urlopen(method, path, body, headers, out)
+            except TelesocialNetworkError:
+                if last or not idempotent or not self._rewind(out, mark):
+                    raise
+                continue
+            if last or resp.status not in self.RETRY_CODES or not (idempotent or resp.status == 503):
+                return resp, data
+            log.debug("%s %s got %s, retrying", method, path, resp.status)
+
+    @staticmethod
+    def _rewind(out, mark):
+        # drops what a failed download already wrote to `out`, so a retry
+        # doesn't append to it; False if `out` can't be rewound
+        if out is None:
+            return True
+        if mark is None:
+            return False
+        try:
+            out.seek(mark)
+            out.truncate()
+        except (AttributeError, IOError, OSError):
+            return False
+        return True
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), OrderedDict()
+        for pool in pools:
+            pool.close()
     
     
 # SIMPLE CLIENT
@@ -99,8 +565,19 @@ class SimpleClient:
     @group NetworkId methods: network_id_*
     @group Conference methods: conference_*
     @group Media methods: media_*
+    @type cache_ttl: float
+    @ivar cache_ttl: seconds the status and list methods (network_id_status,
+        network_id_list, conference_list, conference_details, media_status,
+        media_list) reuse a response; 0, the default, always asks the server
     """
-    def __init__(self, appkey, host='sb.telesocial.com', https=True):
+    # responses kept for cache_ttl before the cache is emptied
+    CACHE_SIZE = 512
+    # shared by every request; http.client only reads them. JSON compresses well,
+    # so API responses are asked for compressed (media downloads are not)
+    _HEADERS = {'Accept-Encoding': 'gzip, deflate'}
+    _FORM_HEADERS = dict(_HEADERS, **{'Content-Type': 'application/x-www-form-urlencoded'})
+
+    def __init__(self, appkey, host='sb.telesocial.com', https=True, pool=None):
         """
         Constructor
 
@@ -110,9 +587,46 @@ class SimpleClient:
         @param host: API server hostname
         @type https: bool
         @param https: specifies whether to use HTTPS or not
-        """
+        @type pool: PoolManager
+        @param pool: keep-alive connection pool to issue requests through; may be
+            shared between clients. A private one is created when omitted
+        """
+        # seconds the status and list methods reuse a response; 0 disables it
+        self.cache_ttl = 0
+        self._cache = {}
+        # bumped by clear_cache, so a read that was in flight then isn't stored
+        self._cache_gen = 0
         self.appkey = appkey
         self.host = ('https://' if https else 'http://') + host
+        # keep-alive connections shared by every call made through this client
+        self._own_pool = pool is None
+        self._pool = PoolManager(num_pools=4, maxsize=16) if pool is None else pool
+        # worker threads behind submit(), started on first use
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        """
+        The PoolManager holding this client's keep-alive connections.
+
+        @rtype: PoolManager
+        """
+        return self._pool
+
+    def close(self):
+        """
+        Stops the submit() worker threads, after the calls already submitted
+        have finished, and closes the client's idle connections. A pool passed
+        to the constructor is left open for the other clients sharing it.
+        The client can still be used afterwards; it reconnects as needed.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        if self._own_pool:
+            self._pool.close()
 
     @property
     def appkey(self):
@@ -121,76 +635,189 @@ class SimpleClient:
     @appkey.setter
     def appkey(self, key):
         self._appkey = key
-        
-    def _do_raw(self, uri, params=None, method='get'):
-        uri = '{0}/api/rest/{1}'.format(self.host, uri)
-
-        params = params or {}
-        if not 'appkey' in params:
-            params['appkey'] = self.appkey
-        query_string = urlencode(params, True)
-        data = None
-
-        method = method.upper()
-        if method in ['POST']: #, 'DELETE']:
-            data = query_string
-        else:
-            uri += '?'+query_string
+        # sent with every request, so encode it once
+        self._appkey_qs = urlencode({'appkey': key})
+        # cached answers belong to the previous application
+        self.clear_cache()
 
-        #print 'URI: {0}\nDATA: {1}'.format(uri, data)
-        req = RequestWithMethod(uri, method, data.encode() if data else None) #, method=method)
-
-        code = 500
-        data = ''
-        try:
-            f = urlopen(req)
-        except URLError as e:
-            if hasattr(e, 'reason'):
-                raise TelesocialNetworkError(e)
-            elif hasattr(e, 'code'):
-                code = e.code
-                data = e.read()
-        else:
-            code = f.getcode()
-            data = f.read()
-            f.close()
+    @property
+    def host(self):
+        return self._host
 
-        return (code, data.decode())
+    @host.setter
+    def host(self, host):
+        self._host = host
+        # every request goes to the same server under the same path, so split it once
+        parts = urlsplit(host)
+        self._scheme, self._netloc = parts.scheme, parts.netloc
+        self._base_path = parts.path + '/api/rest/'
+        # another server may run another version, and has other state
+        self._version = None
+        self.clear_cache()
 
-    def _do(self, *args, **kwargs):
-        code, data = self._do_raw(*args, **kwargs)
+    def invalidate_version(self):
+        """
+        Forgets the cached API version, e.g. after the server was upgraded.
+        """
+        self._version = None
+        
+    def _request(self, uri, params=None, method='GET'):
+        path = self._base_path + uri
+        # formatted only when debug logging is on; the appkey is left out
+        log.debug("%s %s %s", method, path, params)
+
+        if not params:
+            query_string = self._appkey_qs
+        elif 'appkey' in params:
+            query_string = encode_params(params)
+        else:
+            query_string = self._appkey_qs + '&' + encode_params(params)
+
+        # method is passed upper case, as HTTP wants it; only POST sends a form body
+        if method == 'POST':
+            return self._pool.urlopen(method, self._scheme, self._netloc, path,
+                                      query_string.encode(), self._FORM_HEADERS)
+        return self._pool.urlopen(method, self._scheme, self._netloc, path + '?' + query_string,
+                                  None, self._HEADERS)
+
+    def _do(self, uri, params=None, method='GET'):
+        code, data = self._request(uri, params, method)
+        return self._decode(code, data)
+
+    @staticmethod
+    def _decode(code, data):
+        # the body goes to the decoder as bytes
+        if not data.strip():
+            # e.g. 204 No Content; not worth a decoder error and its traceback
+            return Response(code, {})
         try:
-            js = json.loads(data)
-            #print(js)
-            return Response(code, json.loads(data))
-        except:
+            return Response(code, json_loads(data))
+        except ValueError:
             return Response(code, {})
 
 
+    def _check(self, res, codes=None):
+        """
+        Returns `res` if it is a success response, or raises the server's error.
+
+        @type res: Response
+        @param res: server response
+        @type codes: tuple
+        @param codes: status codes to accept instead of any 2xx
+        @rtype: Response
+        @return: `res`
+        @raise TelesocialServiceError: for any other status code
+        """
+        if res.ok if codes is None else res.code in codes:
+            return res
+        raise TelesocialServiceError(res.code, res.message)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Runs one of the client methods on a background thread, so that
+        the caller (e.g. a GUI event loop) is not blocked while waiting
+        for the server. Dependent calls can be chained from the future's
+        done callbacks; asyncio code can await the future through
+        asyncio.wrap_future(), so many calls share this client's connections
+        while they are in flight.
+
+        @type fn: callable or string
+        @param fn: bound method of this client, or its name (e.g. 'media_create')
+        @rtype: concurrent.futures.Future
+        @return: future resolving to whatever `fn` returns or raises
+        @raise TelesocialError: when concurrent.futures is not available
+        """
+        if ThreadPoolExecutor is None:
+            raise TelesocialError(message='concurrent.futures is required for submit()')
+        if not callable(fn):
+            fn = getattr(self, fn)
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=8)
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def call_async(self, fn, *args, **kwargs):
+        """
+        Like submit, but returns an asyncio future, so the call can be awaited
+        (e.g. in asyncio.gather) from a coroutine running in the current event loop.
+
+        @see: SimpleClient.submit
+        @type fn: callable or string
+        @param fn: bound method of this client, or its name (e.g. 'conference_add')
+        @rtype: asyncio.Future
+        @return: future resolving to whatever `fn` returns or raises
+        @raise TelesocialError: when concurrent.futures is not available
+        """
+        import asyncio
+        return asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
     def get(self, uri, query=None):
         return self._do(uri, query)
 
     def post(self, uri, query=None):
-        return self._do(uri, query, 'post')
+        self.clear_cache()
+        return self._do(uri, query, 'POST')
 
     def delete(self, uri, query=None):
-        return self._do(uri, query, 'delete')
+        self.clear_cache()
+        return self._do(uri, query, 'DELETE')
+
+    def _read(self, uri, query=None, method='GET'):
+        """
+        Sends a request that only reads server state. With cache_ttl set, an
+        answer younger than cache_ttl seconds is returned instead of asking
+        again, so polling loops and UI refreshes cost one request per period.
+        Any post, delete or upload (a change on the server) clears the cache.
+        The raw body is kept, so every call gets its own decoded data to change.
+        """
+        if self.cache_ttl <= 0:
+            return self._do(uri, query, method)
+        key = (self._appkey, uri, tuple(sorted(query.items())) if query else ())
+        now = time.time()
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] > now:
+            return self._decode(hit[1], hit[2])
+        gen = self._cache_gen
+        code, data = self._request(uri, query, method)
+        # an answer read while the server state changed may predate the change
+        if code < 500 and gen == self._cache_gen:
+            if len(self._cache) >= self.CACHE_SIZE:
+                self.clear_cache()
+            self._cache[key] = (now + self.cache_ttl, code, data)
+        return self._decode(code, data)
+
+    def clear_cache(self):
+        """
+        Forgets all responses kept for cache_ttl.
+        """
+        self._cache_gen += 1
+        if self._cache:
+            self._cache = {}
 
 
     def version(self):
         """
         Returns 3-tuple containing version components of server API implementation.
+        The server is asked once; later calls return the same tuple until
+        invalidate_version() is called or the host changes.
 
         @rtype: tuple
         @return: 3-tuple of version components, like (1, 3, 10)
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        code, data = self._do_raw('version')
+        if self._version is not None:
+            return self._version
+        # plain text, not JSON, so the undecoded body is used
+        code, data = self._request('version')
         try:
-            return tuple(map(int, data.decode().split('.')))
-        except Exception as e:
-            raise TelesocialServiceError(None, 'Invalid version response: {0}'.format(data))
+            # int() parses the ASCII digits straight from bytes
+            self._version = tuple(map(int, data.split(b'.')))
+            return self._version
+        except ValueError:
+            # shown as text, not as a bytes repr
+            text = data.decode('utf-8', 'replace')
+            raise TelesocialServiceError(None, u'Invalid version response: {0}'.format(text))
 
 
     def network_id_register(self, network_id, phone=None, greeting_id=None):
@@ -217,9 +844,25 @@ class SimpleClient:
             params['greetingid'] = greeting_id
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
+
+    def network_id_register_many(self, registrations, greeting_id=None, max_workers=8):
+        """
+        Registers several (network_id, phone number) pairs, issuing the
+        network_id_register calls concurrently. One failed registration does
+        not stop the others: its error is returned in its place.
+
+        @type registrations: list
+        @param registrations: (network_id, phone) pairs; phone may be None
+        @type greeting_id: string
+        @param greeting_id: the media ID of the greeting to play to the potential registrants
+        @type max_workers: int
+        @param max_workers: maximum number of requests in flight
+        @rtype: list
+        @return: server response or TelesocialError for each pair, in the order of registrations
+        """
+        return concurrent_map(lambda pair: self.network_id_register(pair[0], pair[1], greeting_id),
+                              registrations, max_workers, return_exceptions=True)
 
     def network_id_status(self, network_id, check_related=False):
         """
@@ -238,15 +881,14 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'registrant/{0}'.format(network_id)
+        uri = _URI_REGISTRANT % network_id
         params = {}
         if check_related:
             params['query'] = 'related'
-        res = self.post(uri, params)
+        res = self._read(uri, params, 'POST')
 
-        if res.code in [200, 401, 404]:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        # unknown/unrelated network ids are an answer here, not an error
+        return self._check(res, (200, 401, 404))
 
     def network_id_list(self):
         """
@@ -258,18 +900,14 @@ class SimpleClient:
         @raise TelesocialServiceError: on invalid or unexpected response
         """
         uri = 'registrant'
-        res = self.get(uri)
+        res = self._read(uri)
 
-        if res.code in [200]:
+        if res.code == 200:
             # add the networkids if none passed, and make into an array if only one
             # entry. this makes the client code a little cleaner
-            if 'networkids' not in res.data['NetworkidListResponse']:
-                res.data['NetworkidListResponse']['networkids'] = []
-            elif type(res.data['NetworkidListResponse']['networkids']) is not list:
-                datum = res.data['NetworkidListResponse']['networkids']
-                res.data['NetworkidListResponse']['networkids'] = [datum]
+            ensure_lists(res.data['NetworkidListResponse'], 'networkids')
             return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        raise TelesocialServiceError(res.code, res.message)
         
     def network_id_change(self, network_id, phone):
         """
@@ -284,12 +922,10 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'registrant/{0}/{1}'.format(network_id, phone)
+        uri = _URI_REGISTRANT_PHONE % (network_id, phone)
         res = self.post(uri)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
         
     def network_id_delete(self, network_id):
         """
@@ -297,11 +933,17 @@ class SimpleClient:
         
         Private method! Do not expose!
         """
-        uri = 'registrant/{0}'.format(network_id)
+        uri = _URI_REGISTRANT % network_id
         res = self.delete(uri)
-        if res.code in [200]:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res, (200,))
+
+    def network_id_delete_many(self, network_ids, max_workers=8):
+        """
+        Deletes several Network IDs, issuing the network_id_delete calls concurrently.
+
+        Private method! Do not expose!
+        """
+        return concurrent_map(self.network_id_delete, network_ids, max_workers)
     
     
     def conference_create(self, network_id, greeting_id=None, recording_id=None):
@@ -328,9 +970,7 @@ class SimpleClient:
             params['greetingid'] = greeting_id
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
     def conference_add(self, conference_id, network_id, greeting_id=None, muted=False):
         """
@@ -350,7 +990,7 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'conference/{0}'.format(conference_id)
+        uri = _URI_CONFERENCE % conference_id
         params = {'networkid': network_id, 'action': 'add'}
         if greeting_id:
             params['greetingid'] = greeting_id
@@ -358,28 +998,52 @@ class SimpleClient:
             params['muted'] = 'true'
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
-    def conference_close(self, conference_id):
+    def conference_add_many(self, conference_id, network_ids, greeting_id=None, muted=False, max_workers=8):
+        """
+        Adds several network IDs to a conference. The API has no bulk route, so
+        the conference_add calls are issued concurrently instead of one after another:
+        adding N network IDs takes about N / max_workers round trips rather than N.
+
+        @type conference_id: string
+        @param conference_id: target conference_id
+        @type network_ids: list
+        @param network_ids: network IDs to add to the conference
+        @type greeting_id: string
+        @param greeting_id: the media ID of a pre-recorded greeting,
+            to be played to conference participants when they answer their phones
+        @type muted: bool
+        @param muted: whether to mute the given network IDs upon addition
+        @type max_workers: int
+        @param max_workers: maximum number of requests in flight
+        @rtype: list
+        @return: server responses, in the order of network_ids
+        @raise TelesocialNetworkError: on any connection problems
+        @raise TelesocialServiceError: on invalid or unexpected response
+        """
+        return concurrent_map(lambda network_id: self.conference_add(conference_id, network_id, greeting_id, muted),
+                              network_ids, max_workers)
+
+    def conference_close(self, conference_id, strict=True):
         """
         Closes active conference.
 
         @type conference_id: string
         @param conference_id: the ID of the conference to close
+        @type strict: bool
+        @param strict: when False, an error status (e.g. for a conference
+            that is already closed) is returned instead of raised
         @rtype: Response
         @return: server response
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'conference/{0}'.format(conference_id)
+        uri = _URI_CONFERENCE % conference_id
         params = {'action': 'close'}
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res) if strict else res
 
     def conference_hangup(self, conference_id, network_id):
         """
@@ -394,13 +1058,11 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'conference/{0}/{1}'.format(conference_id, network_id)
+        uri = _URI_CONFERENCE_LEG % (conference_id, network_id)
         params = {'action': 'hangup'}
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
     def conference_move(self, from_id, to_id, network_id):
         """
@@ -417,13 +1079,11 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'conference/{0}/{1}'.format(from_id, network_id)
+        uri = _URI_CONFERENCE_LEG % (from_id, network_id)
         params = {'toconferenceid': to_id, 'action': 'move'}
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
     def conference_mute(self, conference_id, network_id, mute=True):
         """
@@ -440,13 +1100,11 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'conference/{0}/{1}'.format(conference_id, network_id)
+        uri = _URI_CONFERENCE_LEG % (conference_id, network_id)
         params = {'action': 'mute' if mute else 'unmute'}
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
     def conference_unmute(self, conference_id, network_id):
         """
@@ -478,24 +1136,17 @@ class SimpleClient:
         params = {}
         if active:
             params['active'] = 'true'
-        res = self.get(uri, params)
+        res = self._read(uri, params)
 
-        if res.code in [200]:
+        if res.code == 200:
             # add the uploaded key/value if none passed, and make into an array if only one
             # entry. this makes the client code a little cleaner
-            if 'active' not in res.data['ConferenceListResponse']:
-                res.data['ConferenceListResponse']['active'] = []
-            elif type(res.data['ConferenceListResponse']['active']) is not list:
-                datum = res.data['ConferenceListResponse']['active']
-                res.data['ConferenceListResponse']['active'] = [datum]
-            if active == False:
-                if 'inactive' not in res.data['ConferenceListResponse']:
-                    res.data['ConferenceListResponse']['inactive'] = []
-                elif type(res.data['ConferenceListResponse']['inactive']) is not list:
-                    datum = res.data['ConferenceListResponse']['inactive']
-                    res.data['ConferenceListResponse']['inactive'] = [datum]
+            if active:
+                ensure_lists(res.data['ConferenceListResponse'], 'active')
+            else:
+                ensure_lists(res.data['ConferenceListResponse'], 'active', 'inactive')
             return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        raise TelesocialServiceError(res.code, res.message)
 
     def conference_details(self, conference_id):
         """
@@ -508,19 +1159,14 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'conference/{0}'.format(conference_id)
-        res = self.get(uri)
+        uri = _URI_CONFERENCE % conference_id
+        res = self._read(uri)
 
-        if 200 <= res.code < 300:
+        if res.ok:
             # ensure the 'participants is present and an array
-            struct = res.data['ConferenceDetailsResponse']
-            if 'participants' not in struct:
-                struct['participants'] = []
-            elif type(struct['participants']) is not list:
-                datum = struct['participants']
-                struct['participants'] = [datum]
+            ensure_lists(res.data['ConferenceDetailsResponse'], 'participants')
             return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        raise TelesocialServiceError(res.code, res.message)
         
     def media_create(self):
         """
@@ -535,9 +1181,7 @@ class SimpleClient:
         params = {}
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
     def media_record(self, media_id, network_id, greeting_id=None):
         """
@@ -556,15 +1200,13 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'media/{0}'.format(media_id)
+        uri = _URI_MEDIA % media_id
         params = {'networkid': network_id, 'action': 'record'}
         if greeting_id:
             params['greetingid'] = greeting_id
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
     def media_blast(self, media_ids, network_id, greeting_id=None):
         """
@@ -585,15 +1227,34 @@ class SimpleClient:
             media_id = "-".join(media_ids)
         else:
             media_id = media_ids
-        uri = 'media/{0}'.format(media_id)
+        uri = _URI_MEDIA % media_id
         params = {'networkid': network_id, 'action': 'blast'}
         if greeting_id:
             params['greetingid'] = greeting_id
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
+
+    def media_blast_many(self, media_ids, network_ids, greeting_id=None, max_workers=8):
+        """
+        Plays the same audio clip(s) to several network IDs. The API has no bulk route,
+        so the media_blast calls are issued concurrently instead of one after another.
+
+        @type media_ids: string or array/list of strings
+        @param media_ids: the audio media ID(s) to play, in order
+        @type network_ids: list
+        @param network_ids: the network IDs to call
+        @type greeting_id: string
+        @param greeting_id: the media ID of the greeting to play when the phone is answered
+        @type max_workers: int
+        @param max_workers: maximum number of requests in flight
+        @rtype: list
+        @return: server responses, in the order of network_ids
+        @raise TelesocialNetworkError: on any connection problems
+        @raise TelesocialServiceError: on invalid or unexpected response
+        """
+        return concurrent_map(lambda network_id: self.media_blast(media_ids, network_id, greeting_id),
+                              network_ids, max_workers)
 
     def media_status(self, media_id):
         """
@@ -606,13 +1267,27 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'media/status/{0}'.format(media_id)
+        uri = _URI_MEDIA_STATUS % media_id
         params = {}
-        res = self.post(uri, params)
+        res = self._read(uri, params, 'POST')
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
+
+    def media_status_many(self, media_ids, max_workers=8):
+        """
+        Retrieves status information about several Media IDs, issuing the
+        media_status calls concurrently.
+
+        @type media_ids: list
+        @param media_ids: the ids of the media to retrieve status for
+        @type max_workers: int
+        @param max_workers: maximum number of requests in flight
+        @rtype: list
+        @return: server responses, in the order of media_ids
+        @raise TelesocialNetworkError: on any connection problems
+        @raise TelesocialServiceError: on invalid or unexpected response
+        """
+        return concurrent_map(self.media_status, media_ids, max_workers)
 
     def media_request_upload_grant(self, media_id):
         """
@@ -625,13 +1300,11 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'media/{0}'.format(media_id)
+        uri = _URI_MEDIA % media_id
         params = {'action': 'upload_grant'}
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
     def media_remove(self, media_id):
         """
@@ -644,13 +1317,11 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = 'media/{0}'.format(media_id)
+        uri = _URI_MEDIA % media_id
         params = {'action': 'remove'}
         res = self.post(uri, params)
 
-        if 200 <= res.code < 300:
-            return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        return self._check(res)
 
     def media_list(self):
         """
@@ -662,26 +1333,14 @@ class SimpleClient:
         @raise TelesocialServiceError: on invalid or unexpected response
         """
         uri = 'media'
-        res = self.get(uri)
+        res = self._read(uri)
 
-        if res.code in [200]:
+        if res.code == 200:
             # add the uploaded and recorded key/value if none passed, and make them into arrays
             # if only one entry. this makes the client code a little cleaner
-            struct = res.data['MediaidListResponse']
-            
-            if 'uploaded' not in struct:
-                struct['uploaded'] = []
-            elif type(struct['uploaded']) is not list:
-                datum = struct['uploaded']
-                struct['uploaded'] = [datum]
-                
-            if 'recorded' not in struct:
-                struct['recorded'] = []
-            elif type(struct['recorded']) is not list:
-                datum = struct['recorded']
-                struct['recorded'] = [datum]
+            ensure_lists(res.data['MediaidListResponse'], 'uploaded', 'recorded')
             return res
-        raise TelesocialServiceError(res.code, deep_find(res.data, 'message'))
+        raise TelesocialServiceError(res.code, res.message)
         
     def upload_file(self, grant_id, file_path):
         """
@@ -696,43 +1355,39 @@ class SimpleClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        uri = '{0}/{1}'.format(self.host, 'forklift')
+        # the file is streamed from disk rather than read into memory first
+        code, data = self.upload_file_stream(grant_id, file_path)
 
-        import os.path
-        
-        # put these in a format the AcvtiveState recipe wants:
-        #   fields is a sequence of (name, value) elements for regular form fields.
-        #   files is a sequence of (name, filename, value) elements for data to be uploaded as files
-        fields = [('grant', grant_id)]
-        fp = open(file_path, 'rb')
-        files = [('mediafile', os.path.basename(file_path), fp.read())]
-        fp.close()
-        
-        content_type, body = encode_multipart_formdata(fields, files)
-        headers = { 'Content-Type': content_type, 'Content-Length':str(len(body))}
-        request = Request(uri, body, headers)
-    
-        # from the _do_raw method above
-        code = 500
-        data = ''
-        try:
-            f = urlopen(request)
-        except URLError as e:
-            if hasattr(e, 'reason'):
-                raise TelesocialNetworkError(e)
-            elif hasattr(e, 'code'):
-                code = e.code
-                data = e.read()
-        else:
-            code = f.getcode()
-            data = f.read()
-            f.close() #       if 200 <= res.code < 300:
-    
         # should we convert the return into a structured item, like all the other functions?
         
         return (code, data)
+
+    def upload_file_stream(self, grant_id, file_path, progress=None):
+        """
+        Uploads a file like upload_file, but streams it from disk instead of loading
+        it into memory, and can report progress.
+
+        @type grant_id: string
+        @param grant_id: the grant ID of the media, returned from 'request_upload_grant'
+        @type file_path: string
+        @param file_path: path to file to be uploaded
+        @type progress: callable
+        @param progress: called as progress(bytes_sent, total_bytes) while uploading
+        @rtype: tuple
+        @return: (code, data) of the server response
+        @raise TelesocialNetworkError: on any connection problems
+        """
+        uri = self.host + '/forklift'
+        body = MultipartFileBody([('grant', grant_id)], 'mediafile', file_path, progress)
+        headers = {'Content-Type': body.content_type, 'Content-Length': str(body.length)}
+        try:
+            return self._pool.request('POST', uri, body, headers)
+        finally:
+            body.close()
+            # the media's status and the media list have changed
+            self.clear_cache()
     
-    def download_file(self, media_id, file_path):
+    def download_file(self, media_id, file_path, progress=None):
         """
         Helper function to download a media file to the local file system.
         
@@ -740,75 +1395,169 @@ class SimpleClient:
         @param media_id: the media ID that we wish to save locally
         @type file_path: string
         @param file_path: path to file where we will save the data
+        @type progress: callable
+        @param progress: called as progress(bytes_received, total_bytes) as data arrives;
+            total_bytes is 0 when the server did not report the file size
         @rtype: string
-        @return: URL of media upon successful upload
-        @raise TelesocialNetworkError: on any connection problems
-        @raise TelesocialServiceError: on invalid or unexpected response
+        @return: URL the media was downloaded from
+        @raise TelesocialNetworkError: on any connection problems; no file is left behind
+        @raise TelesocialServiceError: on invalid or unexpected response, e.g. when
+            the media has no download URL (yet) or the download was refused
         """
-        url = None
-
         # get the media status
+        status = MediaStatus.parse(self.media_status(media_id))
+        if not status.download_url:
+            raise TelesocialServiceError(200, 'No downloadUrl in media status')
+        size = int(status.size or 0)
+
+        # stream the data straight into the file
+        code = None
+        fp = open(file_path, "wb")
         try:
-            res = self.media_status(media_id)
-            if 'MediaResponse' in res.data:
-                url = res.data['MediaResponse']['downloadUrl']
-        except telesocial.TelesocialError as e:
-            print(e)
-            
-        if url:
-            try:
-                # now get the data
-                f = urlopen(url)
-            except URLError as e:
-                print(e)
-            else:
-                data = f.read()
-                f.close()
-                
-                # write out the file
-                fp = open(file_path, "wb")
-                fp.write(data)
-                fp.close()
+            out = ProgressWriter(fp, size, progress) if progress else fp
+            code, data = self._pool.request('GET', status.download_url, out=out)
+        finally:
+            fp.close()
+            if code != 200:
+                os.remove(file_path)
+        if code != 200:
+            raise TelesocialServiceError(code, 'Download of media %s failed' % media_id)
+        return status.download_url
         
 # Derived from an ActiveState recipe here: http://code.activestate.com/recipes/146306/
-def encode_multipart_formdata(fields, files):
+class MultipartFileBody:
+    """
+    File-like multipart/form-data body for a single file upload. The file is read
+    from disk while the request is being sent, instead of building the whole body
+    in memory first, and an optional callback is told how much has been sent.
+
+    @type boundary: bytes
+    @ivar boundary: multipart boundary, random for each body so that it cannot
+        occur in the uploaded file and cut it short
+    @type content_type: string
+    @ivar content_type: value for the Content-Type header
+    @type length: int
+    @ivar length: total body size, for the Content-Length header
+    """
+    CRLF = b'\r\n'
+
+    def __init__(self, fields, key, file_path, progress=None):
+        """
+        Constructor
+
+        @type fields: list
+        @param fields: sequence of (name, value) elements for regular form fields
+        @type key: string
+        @param key: form field name of the file
+        @type file_path: string
+        @param file_path: path of the file to send
+        @type progress: callable
+        @param progress: called as progress(bytes_sent, total_bytes) as the body is read
+        """
+        # 96 random bits; a fixed boundary could appear in the audio data
+        self.boundary = b'----------Telesocial' + binascii.hexlify(os.urandom(12))
+        dash_boundary = b'--' + self.boundary
+        # only the short text parts are encoded; the file bytes are sent as read
+        L = []
+        for (name, value) in fields:
+            L.append(dash_boundary)
+            L.append(('Content-Disposition: form-data; name="%s"' % name).encode('utf-8'))
+            L.append(b'')
+            L.append(value if isinstance(value, bytes) else ('%s' % value).encode('utf-8'))
+        L.append(dash_boundary)
+        L.append(('Content-Disposition: form-data; name="%s"; filename="%s"'
+                  % (key, os.path.basename(file_path))).encode('utf-8'))
+        L.append(b'Content-Type: audio/mpeg')
+        L.append(b'')
+        L.append(b'')
+        self._head = self.CRLF.join(L)
+        self._tail = self.CRLF + dash_boundary + b'--' + self.CRLF
+        self._file = open(file_path, 'rb')
+        self._progress = progress
+        self.content_type = 'multipart/form-data; boundary=' + self.boundary.decode('ascii')
+        self.length = len(self._head) + os.path.getsize(file_path) + len(self._tail)
+        self.seek(0)
+
+    def seek(self, offset):
+        """
+        Rewinds the body, so a failed request can be sent again. Only offset 0 is supported.
+        """
+        if offset != 0:
+            raise ValueError('MultipartFileBody can only seek to 0')
+        self._file.seek(0)
+        self._parts = [self._head, self._file, self._tail]
+        self._sent = 0
+
+    def read(self, size=-1):
+        """
+        Returns up to `size` bytes of the body (all remaining bytes if size < 0).
+        """
+        chunks = []
+        while self._parts and (size < 0 or size > 0):
+            part = self._parts[0]
+            if isinstance(part, bytes):
+                chunk = part if size < 0 else part[:size]
+                rest = part[len(chunk):]
+                if rest:
+                    self._parts[0] = rest
+                else:
+                    self._parts.pop(0)
+            else:
+                chunk = part.read(size)
+                if not chunk or size < 0:
+                    self._parts.pop(0)
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        data = b''.join(chunks)
+        self._sent += len(data)
+        if self._progress and data:
+            self._progress(self._sent, self.length)
+        return data
+
+    def close(self):
+        self._file.close()
+
+class ProgressWriter:
     """
-    fields is a sequence of (name, value) elements for regular form fields.
-    files is a sequence of (name, filename, value) elements for data to be uploaded as files
-    Return (content_type, body) ready for httplib or urllib call
+    Wraps a writable file and reports how much has been written to it.
     """
-    BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
-    CRLF = '\r\n'
-    L = []
-    for (key, value) in fields:
-        L.append('--' + BOUNDARY)
-        L.append('Content-Disposition: form-data; name="%s"' % key)
-        L.append('')
-        L.append(value)
-    for (key, filename, value) in files:
-        L.append('--' + BOUNDARY)
-        L.append('Content-Disposition: form-data; name="%s"; filename="%s"' % (key, filename))
-        # We hard-code this here, since we only deal with one type. Plus, the mimetools returns audio/x-mpg, which Telesocial doesn't like
-        L.append('Content-Type: %s' % 'audio/mpeg') 
-        L.append('')
-        L.append(value)
-    L.append('--' + BOUNDARY + '--')
-    L.append('')
-    body = CRLF.join(L)
-    content_type = 'multipart/form-data; boundary=%s' % BOUNDARY
-    return content_type, body
+    def __init__(self, fp, total, progress):
+        """
+        Constructor
+
+        @type fp: file
+        @param fp: writable file to pass the data on to
+        @type total: int
+        @param total: expected number of bytes, or 0 if unknown
+        @type progress: callable
+        @param progress: called as progress(bytes_written, total) after each write
+        """
+        self._fp = fp
+        self._total = total
+        self._progress = progress
+        self._written = 0
+
+    def write(self, data):
+        self._fp.write(data)
+        self._written += len(data)
+        self._progress(self._written, self._total)
 
     
 # RICH CLIENT
-class RichClientItem:
+class RichClientItem(object):
     """
-    Base class for API items like Media, Conference or NetworkID
+    Base class for API items like Media, Conference or NetworkID.
+    Items are created one per ID, so they keep their two attributes in
+    slots instead of a per-instance __dict__.
 
     @type _id: string
     @ivar _id: item id
     @type _c: SimpleClient
     @ivar _c: reference to related SimpleClient instance
     """
+    __slots__ = ('_id', '_c')
+
     def __init__(self, id, client):
         """
         Constructor.
@@ -840,13 +1589,6 @@ class RichClientItem:
         """
         return self._id
 
-    def __len__(self):
-        """
-        Rasies TypeError, to workaround bug in urllib2.urlencode function.
-        @raise TypeError: always
-        """
-        raise TypeError()
-
     @property
     def id(self):
         """
@@ -863,13 +1605,38 @@ class NetworkId(RichClientItem):
     NetworkId item, storing network_id and providing convenient access to
     network_id related methods.
     """
-    def __init__(self, *args, **kwargs):
+    __slots__ = ('_status_code', '_status_time')
+    # seconds exists and related reuse one network_id_status answer
+    STATUS_TTL = 2.0
+
+    def __init__(self, id, client):
         """
         Constructor.
 
         @see: RichClientItem.__init__
         """
-        RichClientItem.__init__(self, *args, **kwargs)
+        self._id = id
+        self._c = client
+        self._status_code = None
+        self._status_time = 0.0
+
+    def _get_status_code(self):
+        """
+        Status code of network_id_status(related), shared by exists and related,
+        so checking both costs a single request per STATUS_TTL.
+
+        @rtype: int
+        """
+        if self._status_code is None or time.time() - self._status_time >= self.STATUS_TTL:
+            self._status_code = self._c.network_id_status(self._id, True).code
+            self._status_time = time.time()
+        return self._status_code
+
+    def invalidate(self):
+        """
+        Forgets the cached registration status; the next property access asks the server.
+        """
+        self._status_code = None
 
     @property
     def exists(self):
@@ -881,10 +1648,7 @@ class NetworkId(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        res = self._c.network_id_status(self._id, True)
-        if res.code in [200, 401]:
-            return True
-        return False
+        return self._get_status_code() in (200, 401)
 
     @property
     def related(self):
@@ -898,10 +1662,7 @@ class NetworkId(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        res = self._c.network_id_status(self._id, True)
-        if res.code == 200:
-            return True
-        return False
+        return self._get_status_code() == 200
 
     def blast(self, media_id, greeting_id=None):
         """
@@ -1018,13 +1779,7 @@ class Conference(RichClientItem):
     Conference item, storing conference_id and providing convenient access to
     conference related methods.
     """
-    def __init__(self, *args, **kwargs):
-        """
-        Constructor.
-
-        @see: RichClientItem.__init__
-        """
-        RichClientItem.__init__(self, *args, **kwargs)
+    __slots__ = ()
 
     def add(self, network_ids, greeting_id=None):
         """
@@ -1043,17 +1798,19 @@ class Conference(RichClientItem):
         """
         return self._c.conference_add(self._id, network_ids, greeting_id)
 
-    def close(self):
+    def close(self, strict=True):
         """
         Closes this conference, if it is active.
 
         @see: SimpleClient.conference_close
+        @type strict: bool
+        @param strict: when False, an error status is returned instead of raised
         @rtype: Response
         @return: server response
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        return self._c.conference_close(self._id)
+        return self._c.conference_close(self._id, strict)
 
     def hangup(self, network_id):
         """
@@ -1083,7 +1840,7 @@ class Conference(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        return self._c.conference_move(self._id, to_conference, network_id)
+        return self._c.conference_move(self._id, to_id, network_id)
 
     def mute(self, network_id):
         """
@@ -1113,19 +1870,134 @@ class Conference(RichClientItem):
         """
         return self._c.conference_unmute(self._id, network_id)
 
+    def add_many(self, network_ids, greeting_id=None, max_workers=8):
+        """
+        Adds several network_ids to this conference concurrently.
+
+        @see: SimpleClient.conference_add_many
+        @type network_ids: list
+        @param network_ids: networkids to add to the conference
+        @type greeting_id: string
+        @param greeting_id: the media ID of a pre-recorded greeting,
+            to be played to conference participants when they answer their phones
+        @type max_workers: int
+        @param max_workers: maximum number of requests in flight
+        @rtype: list
+        @return: server responses, in the order of network_ids
+        @raise TelesocialNetworkError: on any connection problems
+        @raise TelesocialServiceError: on invalid or unexpected response
+        """
+        return self._c.conference_add_many(self._id, network_ids, greeting_id, max_workers=max_workers)
+
+    def hangup_many(self, network_ids, max_workers=8):
+        """
+        Terminates several call legs from this conference. The API has no bulk
+        route, so the conference_hangup calls are issued concurrently.
+
+        @see: SimpleClient.conference_hangup
+        @type network_ids: list
+        @param network_ids: the network IDs to terminate from the call
+        @type max_workers: int
+        @param max_workers: maximum number of requests in flight
+        @rtype: list
+        @return: server responses, in the order of network_ids
+        @raise TelesocialNetworkError: on any connection problems
+        @raise TelesocialServiceError: on invalid or unexpected response
+        """
+        c, conference_id = self._c, self._id
+        return concurrent_map(lambda network_id: c.conference_hangup(conference_id, network_id),
+                              network_ids, max_workers)
+
+    def mute_many(self, network_ids, mute=True, max_workers=8):
+        """
+        Mutes (or un-mutes) several call legs, issuing the calls concurrently.
+
+        @see: SimpleClient.conference_mute
+        @type network_ids: list
+        @param network_ids: the network IDs to be muted
+        @type mute: bool
+        @param mute: False to un-mute them instead
+        @type max_workers: int
+        @param max_workers: maximum number of requests in flight
+        @rtype: list
+        @return: server responses, in the order of network_ids
+        @raise TelesocialNetworkError: on any connection problems
+        @raise TelesocialServiceError: on invalid or unexpected response
+        """
+        c, conference_id = self._c, self._id
+        return concurrent_map(lambda network_id: c.conference_mute(conference_id, network_id, mute),
+                              network_ids, max_workers)
+
+
+class MediaStatus(namedtuple('MediaStatus', 'exists download_url size')):
+    """
+    The fields of a media_status response that Media properties expose,
+    picked out of the JSON once when the response is cached.
+    download_url and size are None if the server left them out.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, res):
+        """
+        @type res: Response
+        @param res: media_status response
+        @rtype: MediaStatus
+        """
+        if res.code != 200:
+            return cls(False, None, None)
+        mr = res.data.get('MediaResponse') if isinstance(res.data, dict) else None
+        if not isinstance(mr, dict):
+            return cls(True, None, None)
+        return cls(True, mr.get('downloadUrl'), mr.get('fileSize'))
 
 class Media(RichClientItem):
     """
     Media item, storing media_id and providing convenient access to
     media related methods and properties.
     """
-    def __init__(self, *args, **kwargs):
+    __slots__ = ('_status', '_status_time')
+    # seconds the properties reuse one media_status response
+    STATUS_TTL = 2.0
+
+    def __init__(self, id, client, status=None):
         """
-        Constructor.
+        Constructor. Sets the slots directly rather than going through
+        RichClientItem.__init__ and invalidate(), as RichClient creates
+        Media items in bulk.
 
         @see: RichClientItem.__init__
+        @type status: Response
+        @param status: media_status response already fetched for this id,
+            served by the properties for STATUS_TTL seconds
+        """
+        self._id = id
+        self._c = client
+        self._status = MediaStatus.parse(status) if status is not None else None
+        self._status_time = time.time() if status is not None else 0.0
+
+    def _get_status(self):
+        """
+        Parsed media_status response shared by the properties, so reading several
+        of them (or one repeatedly) costs a single request per STATUS_TTL.
+
+        @rtype: MediaStatus
+        """
+        if self._status is None or time.time() - self._status_time >= self.STATUS_TTL:
+            self._set_status(self._c.media_status(self._id))
+        return self._status
+
+    def _set_status(self, res):
+        self._status = MediaStatus.parse(res)
+        self._status_time = time.time()
+        return res
+
+    def invalidate(self):
         """
-        RichClientItem.__init__(self, *args, **kwargs)
+        Forgets the cached media status; the next property access asks the server.
+        """
+        self._status = None
+        self._status_time = 0.0
 
     @property
     def content_exists(self):
@@ -1137,10 +2009,7 @@ class Media(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        res = self._c.media_status(self._id)
-        if res.code == 200:
-            return True
-        return False
+        return self._get_status().exists
 
     @property
     def download_url(self):
@@ -1152,13 +2021,10 @@ class Media(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        res = self._c.media_status(self._id)
-        if res.code == 200:
-            try:
-                return res.data['MediaResponse']['downloadUrl']
-            except Exception as e:
-                raise TelesocialServiceError(original=e)
-        return None
+        status = self._get_status()
+        if status.exists and status.download_url is None:
+            raise TelesocialServiceError(200, 'No downloadUrl in media status')
+        return status.download_url
 
     @property
     def size(self):
@@ -1170,13 +2036,10 @@ class Media(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        res = self._c.media_status(self._id)
-        if res.code == 200:
-            try:
-                return res.data['MediaResponse']['fileSize']
-            except Exception as e:
-                raise TelesocialServiceError(original=e)
-        return None
+        status = self._get_status()
+        if status.exists and status.size is None:
+            raise TelesocialServiceError(200, 'No fileSize in media status')
+        return status.size
 
     @property
     def upload_grant(self):
@@ -1190,10 +2053,7 @@ class Media(RichClientItem):
         @raise TelesocialServiceError: on invalid or unexpected response
         """
         res = self._c.media_request_upload_grant(self._id)
-        try:
-            return res.data['UploadResponse']['grantId']
-        except Exception as e:
-            raise TelesocialServiceError(original=e)
+        return response_field(res, 'UploadResponse', 'grantId')
 
     def record(self, network_id, greeting_id=None):
         """
@@ -1209,6 +2069,7 @@ class Media(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
+        self.invalidate()
         return self._c.media_record(self._id, network_id, greeting_id)
 
     def blast(self, network_id, greeting_id=None):
@@ -1225,8 +2086,33 @@ class Media(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
+        self.invalidate()
         return self._c.media_blast(self._id, network_id, greeting_id)
 
+    def record_async(self, network_id, greeting_id=None):
+        """
+        Like record, but returns at once; the call runs on the client's worker threads.
+
+        @see: Media.record, SimpleClient.submit
+        @rtype: concurrent.futures.Future
+        @return: future resolving to the server response
+        @raise TelesocialError: when concurrent.futures is not available
+        """
+        self.invalidate()
+        return self._c.submit(self._c.media_record, self._id, network_id, greeting_id)
+
+    def blast_async(self, network_id, greeting_id=None):
+        """
+        Like blast, but returns at once, so blasts to many network IDs overlap.
+
+        @see: Media.blast, SimpleClient.submit
+        @rtype: concurrent.futures.Future
+        @return: future resolving to the server response
+        @raise TelesocialError: when concurrent.futures is not available
+        """
+        self.invalidate()
+        return self._c.submit(self._c.media_blast, self._id, network_id, greeting_id)
+
     def status(self):
         """
         Retrieves unmodified status information about this Media ID.
@@ -1237,7 +2123,7 @@ class Media(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        return self._c.media_status(self._id)
+        return self._set_status(self._c.media_status(self._id))
 
     def remove(self):
         """
@@ -1249,29 +2135,77 @@ class Media(RichClientItem):
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
+        self.invalidate()
         return self._c.media_remove(self._id)
 
 
-class RichClient:
+class RichClient(object):
     """
     More Object Oriented wrapper around SimpleClient. Provides the same functions
-    in a bit friendlier way.
+    in a bit friendlier way. Every method goes through _c, which is kept in a
+    slot like the items' attributes.
 
     @type _c: SimpleClient
     @ivar _c: reference to related SimpleClient instance
+    @type _own_client: bool
+    @ivar _own_client: whether _c was created here, and so is closed by close()
     """
+    __slots__ = ('_c', '_own_client')
     def __init__(self, *args, **kwargs):
         """
-        Constructor.
+        Constructor. Takes the same arguments as SimpleClient, or a ready
+        SimpleClient as the `client` keyword: short-lived RichClients (e.g. one
+        per web request) can then share one client and its connections.
 
         @see: SimpleClient.__init__
+        @type client: SimpleClient
+        @param client: client to wrap instead of creating a new one
+        """
+        client = kwargs.pop('client', None)
+        self._own_client = client is None
+        self._c = SimpleClient(*args, **kwargs) if client is None else client
+
+    def close(self):
+        """
+        Releases the underlying client's threads and connections. A client
+        passed as `client` is left open for the others sharing it.
+
+        @see: SimpleClient.close
+        """
+        if self._own_client:
+            self._c.close()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Runs a call on the underlying client's worker threads, e.g.
+        rc.submit(conference.add, network_id).
+
+        @see: SimpleClient.submit
+        @type fn: callable or string
+        @param fn: any callable, such as a bound method of an item, or the name of a SimpleClient method
+        @rtype: concurrent.futures.Future
+        @return: future resolving to whatever `fn` returns or raises
+        @raise TelesocialError: when concurrent.futures is not available
+        """
+        return self._c.submit(fn, *args, **kwargs)
+
+    def call_async(self, fn, *args, **kwargs):
+        """
+        Like submit, but awaitable from asyncio, e.g.
+        await asyncio.gather(*(rc.call_async(conference.add, n) for n in network_ids)).
+
+        @see: SimpleClient.call_async
+        @rtype: asyncio.Future
+        @return: future resolving to whatever `fn` returns or raises
+        @raise TelesocialError: when concurrent.futures is not available
         """
-        self._c = SimpleClient(*args, **kwargs)
+        return self._c.call_async(fn, *args, **kwargs)
 
     def version(self):
         """
         Returns 3-tuple containing version components of server API implementation.
 
+        @see: SimpleClient.version
         @rtype: tuple
         @return: 3-tuple of version components, like (1, 3, 10)
         @raise TelesocialNetworkError: on any connection problems
@@ -1279,6 +2213,14 @@ class RichClient:
         """
         return self._c.version()
 
+    def invalidate_version(self):
+        """
+        Forgets the cached API version, e.g. after the server was upgraded.
+
+        @see: SimpleClient.invalidate_version
+        """
+        self._c.invalidate_version()
+
     def register_network_id(self, network_id, phone=None, greeting_id=None):
         """
         Registers (network_id, phone number) pair for new network_id, or relates existing
@@ -1297,8 +2239,9 @@ class RichClient:
         @raise TelesocialNetworkError: on any connection problems
         @raise TelesocialServiceError: on invalid or unexpected response
         """
-        res = self._c.network_id_register(network_id, phone, greeting_id)
-        return self.get_network_id(network_id)
+        # raises unless the server accepted the registration, so the id is known to be good
+        self._c.network_id_register(network_id, phone, greeting_id)
+        return NetworkId(network_id, self._c)
 
     def get_network_id(self, id):
         """
@@ -1329,10 +2272,7 @@ class RichClient:
         @raise TelesocialServiceError: on invalid or unexpected response
         """
         res = self._c.conference_create(network_id, greeting_id, recording_id)
-        try:
-            return self.get_conference(res.data['ConferenceResponse']['conferenceId'])
-        except Exception as e:
-            raise TelesocialServiceError(original=e)
+        return self.get_conference(response_field(res, 'ConferenceResponse', 'conferenceId'))
 
     def get_conference(self, id):
         """
@@ -1356,10 +2296,24 @@ class RichClient:
         @raise TelesocialServiceError: on invalid or unexpected response
         """
         res = self._c.media_create()
-        try:
-            return self.get_media(res.data['MediaResponse']['mediaId'])
-        except Exception as e:
-            raise TelesocialServiceError(original=e)
+        return self.get_media(response_field(res, 'MediaResponse', 'mediaId'))
+
+    def create_media_with_grant(self):
+        """
+        Creates a new Media ID and requests permission to upload a file to it,
+        the usual first steps of an upload. The two requests depend on each
+        other, so they are sent back-to-back on the same kept-alive connection.
+
+        @see: SimpleClient.media_create, SimpleClient.media_request_upload_grant
+        @rtype: tuple
+        @return: (Media instance, grant id)
+        @raise TelesocialNetworkError: on any connection problems
+        @raise TelesocialServiceError: on invalid or unexpected response
+        """
+        c = self._c
+        media_id = response_field(c.media_create(), 'MediaResponse', 'mediaId')
+        grant_id = response_field(c.media_request_upload_grant(media_id), 'UploadResponse', 'grantId')
+        return Media(media_id, c), grant_id
 
     def get_media(self, id):
         """
@@ -1370,4 +2324,21 @@ class RichClient:
         @rtype: Media
         @return: Media instance
         """
-        return Media(id, self._c)
\ No newline at end of file
+        return Media(id, self._c)
+
+    def get_media_many(self, ids):
+        """
+        Create Media items for several ids, fetching their statuses concurrently,
+        so that reading their properties does not cost a request per item.
+
+        @see: SimpleClient.media_status_many
+        @type ids: list
+        @param ids: the media IDs to be wrapped into Media items
+        @rtype: list
+        @return: Media instances, in the order of ids
+        @raise TelesocialNetworkError: on any connection problems
+        @raise TelesocialServiceError: on invalid or unexpected response
+        """
+        ids = list(ids)
+        c = self._c
+        return [Media(id, c, res) for id, res in zip(ids, c.media_status_many(ids))]
\ No newline at end of file
@@ -0,0 +1,380 @@
+"""
+Tests for the telesocial module, run against a local HTTP server:
+
+    python -m unittest discover tests
+"""
+
+import gzip
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+    # Python 3.x versions
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    # Python 2.x versions
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import telesocial
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), Handler)
+        # (method, path, headers, body) of every request, and the client ports seen
+        self.log = []
+        self.ports = set()
+        # path -> how many more times a /flaky/ path fails
+        self.failures = {}
+        self.lock = threading.Lock()
+
+    @property
+    def netloc(self):
+        return '%s:%d' % self.server_address
+
+    def url(self, path):
+        return 'http://%s%s' % (self.netloc, path)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # an idle keep-alive connection is dropped after this many seconds
+    timeout = 0.3
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, body=b'', headers=None):
+        self.send_response(code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reply_json(self, code, data):
+        self.reply(code, json.dumps(data).encode('utf-8'), {'Content-Type': 'application/json'})
+
+    def handle_any(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        server = self.server
+        with server.lock:
+            server.log.append((method, self.path, self.headers, body))
+            server.ports.add(self.client_address[1])
+        path = self.path.split('?')[0]
+        if path.startswith('/flaky/'):
+            # /flaky/<code>: <code> while failures last, then 200
+            with server.lock:
+                left = server.failures.get(self.path, 0)
+                server.failures[self.path] = left - 1
+            return self.reply(int(path.split('/')[2]) if left > 0 else 200, b'done')
+        if path == '/redirect':
+            return self.reply(302, headers={'Location': '/file'})
+        if path == '/file':
+            return self.reply(200, b'ID3' + b'x' * 1000, {'Content-Type': 'audio/mpeg'})
+        if path == '/gzip':
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+                f.write(b'{"zipped": true}')
+            return self.reply(200, buf.getvalue(), {'Content-Encoding': 'gzip'})
+        if path == '/forklift':
+            return self.reply(201, b'http://media/1.mp3')
+        if path.startswith('/api/rest/registrant'):
+            if method == 'GET':
+                # the appkey is echoed back, so a test can tell whose answer it got
+                return self.reply_json(200, {'NetworkidListResponse': {'networkids': [self.path]}})
+            return self.reply_json(201, {'RegistrationResponse': {'status': 201}})
+        if path.startswith('/api/rest/conference/'):
+            return self.reply_json(200, {'ConferenceResponse': {'status': 200}})
+        self.reply_json(404, {'message': 'not found'})
+
+    def do_GET(self):
+        self.handle_any('GET')
+
+    def do_POST(self):
+        self.handle_any('POST')
+
+    def do_DELETE(self):
+        self.handle_any('DELETE')
+
+
+class RawServer(object):
+    """
+    Socket server for responses http.server can't produce: each accepted
+    connection is handed to the next of `replies`, called as reply(socket).
+    """
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(5)
+        thread = threading.Thread(target=self.serve)
+        thread.daemon = True
+        thread.start()
+
+    def url(self, path):
+        return 'http://127.0.0.1:%d%s' % (self.sock.getsockname()[1], path)
+
+    def serve(self):
+        while self.replies:
+            conn, addr = self.sock.accept()
+            self.requests.append(conn.recv(65536))
+            self.replies.pop(0)(conn)
+            conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+def full(body):
+    def reply(conn):
+        conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n' % len(body) + body)
+    return reply
+
+def truncated(body, sent):
+    def reply(conn):
+        conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n' % len(body) + body[:sent])
+    return reply
+
+
+class ServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = Server()
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+        self.pool = telesocial.PoolManager(backoff_factor=0.01)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class PoolTest(ServerTestCase):
+
+    def test_connection_reused(self):
+        for i in range(3):
+            self.assertEqual(self.pool.request('GET', self.server.url('/file'))[0], 200)
+        self.assertEqual(len(self.server.ports), 1)
+
+    def test_connection_dropped_by_server_is_replaced(self):
+        # the server drops the idle connection; a POST written to it would not be resent
+        self.pool.retries = 0
+        self.assertEqual(self.pool.request('POST', self.server.url('/forklift'), b'a=1')[0], 201)
+        time.sleep(Handler.timeout + 0.3)
+        conn, reused = self.pool._pool('http', self.server.netloc)._get_conn()
+        conn.close()
+        self.assertFalse(reused)
+        self.assertEqual(self.pool.request('POST', self.server.url('/forklift'), b'a=1')[0], 201)
+        self.assertEqual(len(self.server.ports), 2)
+
+    def test_idle_timeout(self):
+        self.pool.idle_timeout = 0
+        self.pool.request('GET', self.server.url('/file'))
+        self.pool.request('GET', self.server.url('/file'))
+        self.assertEqual(len(self.server.ports), 2)
+
+    def test_retry_502_for_get(self):
+        self.server.failures['/flaky/502'] = 2
+        self.assertEqual(self.pool.request('GET', self.server.url('/flaky/502')), (200, b'done'))
+        self.assertEqual(len(self.server.log), 3)
+
+    def test_no_retry_502_for_post(self):
+        self.server.failures['/flaky/502'] = 1
+        self.assertEqual(self.pool.request('POST', self.server.url('/flaky/502'), b'')[0], 502)
+        self.assertEqual(len(self.server.log), 1)
+
+    def test_retry_503_for_post(self):
+        self.server.failures['/flaky/503'] = 1
+        self.assertEqual(self.pool.request('POST', self.server.url('/flaky/503'), b'')[0], 200)
+        self.assertEqual(len(self.server.log), 2)
+
+    def test_retries_exhausted(self):
+        self.server.failures['/flaky/504'] = 10
+        self.assertEqual(self.pool.request('GET', self.server.url('/flaky/504'))[0], 504)
+        self.assertEqual(len(self.server.log), self.pool.retries + 1)
+
+    def test_redirected_download(self):
+        out = io.BytesIO()
+        self.assertEqual(self.pool.request('GET', self.server.url('/redirect'), out=out), (200, b''))
+        self.assertEqual(out.getvalue(), b'ID3' + b'x' * 1000)
+
+    def test_gzip_decoded(self):
+        headers = {'Accept-Encoding': 'gzip'}
+        self.assertEqual(self.pool.request('GET', self.server.url('/gzip'), headers=headers),
+                         (200, b'{"zipped": true}'))
+
+
+class DownloadTest(unittest.TestCase):
+    BODY = b'x' * 200000
+
+    def setUp(self):
+        self.pool = telesocial.PoolManager(backoff_factor=0.01)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_truncated_download_fails(self):
+        server = RawServer(*[truncated(b'x' * 100, 50)] * 3)
+        try:
+            self.assertRaises(telesocial.TelesocialNetworkError,
+                              self.pool.request, 'GET', server.url('/f'), out=io.BytesIO())
+        finally:
+            server.close()
+
+    def test_retry_rewinds_download(self):
+        server = RawServer(truncated(self.BODY, 70000), full(self.BODY))
+        try:
+            out = io.BytesIO()
+            out.write(b'kept')
+            self.assertEqual(self.pool.request('GET', server.url('/f'), out=out), (200, b''))
+            self.assertEqual(out.getvalue(), b'kept' + self.BODY)
+        finally:
+            server.close()
+
+    def test_post_written_on_dead_connection_not_resent(self):
+        # the first response keeps the connection; the server then drops it unanswered
+        def drop(conn):
+            conn.recv(65536)
+        def answer_then_drop(conn):
+            full(b'ok')(conn)
+            server.requests.append(conn.recv(65536))
+        server = RawServer(answer_then_drop, drop)
+        try:
+            self.pool.retries = 0
+            self.pool.request('POST', server.url('/p'), b'a=1')
+            self.assertRaises(telesocial.TelesocialNetworkError,
+                              self.pool.request, 'POST', server.url('/p'), b'a=1')
+            self.assertEqual(len([r for r in server.requests if r.startswith(b'POST')]), 2)
+        finally:
+            server.close()
+
+
+class MultipartTest(ServerTestCase):
+
+    def test_upload_body(self):
+        content = os.urandom(100000)
+        fd, path = tempfile.mkstemp(suffix='.mp3')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        try:
+            client = telesocial.SimpleClient('key', self.server.netloc, https=False, pool=self.pool)
+            progress = []
+            code, data = client.upload_file_stream('g1', path, lambda done, total: progress.append((done, total)))
+        finally:
+            os.remove(path)
+        self.assertEqual((code, data), (201, b'http://media/1.mp3'))
+        method, url, headers, body = self.server.log[-1]
+        self.assertEqual(int(headers['Content-Length']), len(body))
+        boundary = headers['Content-Type'].split('boundary=')[1].encode('ascii')
+        self.assertTrue(body.startswith(b'--' + boundary + b'\r\n'))
+        self.assertTrue(body.endswith(b'\r\n--' + boundary + b'--\r\n'))
+        self.assertIn(b'name="grant"\r\n\r\ng1\r\n', body)
+        self.assertIn(b'\r\n\r\n' + content + b'\r\n--' + boundary, body)
+        self.assertEqual(progress[-1], (len(body), len(body)))
+
+
+class CacheTest(ServerTestCase):
+
+    def setUp(self):
+        ServerTestCase.setUp(self)
+        self.client = telesocial.SimpleClient('key-A', self.server.netloc, https=False, pool=self.pool)
+        self.client.cache_ttl = 60
+
+    def reads(self):
+        return len([entry for entry in self.server.log if entry[0] == 'GET'])
+
+    def test_reused(self):
+        first = self.client.network_id_list()
+        self.assertEqual(self.client.network_id_list().data, first.data)
+        self.assertEqual(self.reads(), 1)
+
+    def test_disabled(self):
+        self.client.cache_ttl = 0
+        self.client.network_id_list()
+        self.client.network_id_list()
+        self.assertEqual(self.reads(), 2)
+
+    def test_hits_are_copies(self):
+        self.client.network_id_list()
+        self.client.network_id_list().data['NetworkidListResponse']['networkids'].append('changed')
+        self.assertNotIn('changed', self.client.network_id_list().data['NetworkidListResponse']['networkids'])
+
+    def test_post_clears(self):
+        self.client.network_id_list()
+        self.client.network_id_register('alice', '15551234567')
+        self.client.network_id_list()
+        self.assertEqual(self.reads(), 2)
+
+    def test_appkey_change_clears(self):
+        self.client.network_id_list()
+        self.client.appkey = 'key-B'
+        ids = self.client.network_id_list().data['NetworkidListResponse']['networkids']
+        self.assertIn('key-B', ids[0])
+        self.assertEqual(self.reads(), 2)
+
+    def test_host_change_clears(self):
+        self.client.network_id_list()
+        self.client.host = 'http://' + self.server.netloc
+        self.client.network_id_list()
+        self.assertEqual(self.reads(), 2)
+
+    def test_read_during_clear_not_stored(self):
+        request = self.client._request
+        def racing(*args):
+            result = request(*args)
+            # a post completes while this read is on its way back
+            self.client.clear_cache()
+            return result
+        self.client._request = racing
+        self.client.network_id_list()
+        self.client._request = request
+        self.client.network_id_list()
+        self.assertEqual(self.reads(), 2)
+
+
+class ManyTest(ServerTestCase):
+
+    def test_conference_add_many(self):
+        client = telesocial.SimpleClient('key', self.server.netloc, https=False, pool=self.pool)
+        ids = ['n%d' % i for i in range(10)]
+        responses = client.conference_add_many('c1', ids, max_workers=4)
+        self.assertEqual([res.code for res in responses], [200] * len(ids))
+        forms = [dict(pair.split('=') for pair in body.decode('ascii').split('&'))
+                 for method, path, headers, body in self.server.log]
+        self.assertEqual(sorted(form['networkid'] for form in forms), sorted(ids))
+
+    def test_concurrent_map_keeps_order(self):
+        def slow(i):
+            time.sleep(0.01 * (5 - i))
+            return i
+        self.assertEqual(telesocial.concurrent_map(slow, range(5)), list(range(5)))
+
+    def test_concurrent_map_return_exceptions(self):
+        def fail_odd(i):
+            if i % 2:
+                raise telesocial.TelesocialServiceError(500, 'odd')
+            return i
+        results = telesocial.concurrent_map(fail_odd, range(4), return_exceptions=True)
+        self.assertEqual(results[::2], [0, 2])
+        self.assertTrue(all(isinstance(e, telesocial.TelesocialServiceError) for e in results[1::2]))
+
+
+if __name__ == '__main__':
+    unittest.main()